@@ -1,5 +1,5 @@
 import os
-from flask import Flask
+from flask import Flask, jsonify
 from flask_jwt_extended import JWTManager
 from app.extensions import db, Migrate
 from app.config import Config
@@ -9,6 +9,10 @@ migrate = Migrate()
 
 def create_app(config_name=None):
     app = Flask(__name__)
+
+    # Serializes UUID/date/datetime itself (orjson when installed)
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
     
     # Use test config if specified
     if config_name == 'testing':
@@ -17,6 +21,9 @@ def create_app(config_name=None):
     else:
         app.config.from_object(Config)
 
+    from app.utils import structured_logging
+    structured_logging.init_app(app)
+
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "test-secret-key")
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES", 3600))
 
@@ -27,10 +34,46 @@ def create_app(config_name=None):
         response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
         return response
 
+    from app.utils.pagination import InvalidCursor
+
+    @app.errorhandler(InvalidCursor)
+    def handle_invalid_cursor(e):
+        return jsonify({"message": str(e)}), 400
+
+    from app.utils import pool_telemetry
+    pool_telemetry.init_app(app)
+
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
 
+    # Per-endpoint wall/DB time and statement counts, served at /metrics
+    from app.utils.metrics import request_metrics
+    request_metrics.init_app(app)
+
+    from app.utils.slow_queries import slow_query_log
+    slow_query_log.init_app(app)
+
+    from app.services import auth_state
+    auth_state.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_token_revoked(jwt_header, jwt_payload):
+        return auth_state.is_token_revoked(jwt_payload)
+
+    @jwt.revoked_token_loader
+    def revoked_token_response(jwt_header, jwt_payload):
+        return jsonify({"message": "Session expired. Please log in again."}), 401
+
+    from app.services.reference_data import reference_data
+    reference_data.init_app(app)
+
+    from app.services.holiday_cache import holiday_cache
+    holiday_cache.init_app(app)
+
+    from app.services.working_calendar import working_calendar
+    working_calendar.init_app(app)
+
     # Blueprints AFTER CORS
     from app.routes.auth import auth_bp
     from app.routes.user import user_bp
@@ -39,6 +82,8 @@ def create_app(config_name=None):
     from app.routes.admin import admin_bp
     from app.routes.analytics import analytics_bp
     from app.routes.holiday import holiday_bp
+    from app.routes.health import health_bp
+    from app.routes.metrics import metrics_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
@@ -47,5 +92,12 @@ def create_app(config_name=None):
     app.register_blueprint(admin_bp)
     app.register_blueprint(analytics_bp)
     app.register_blueprint(holiday_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
+
+    from app.cli import leaves_cli, ledger_cli, stats_cli
+    app.cli.add_command(leaves_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(stats_cli)
 
     return app
\ No newline at end of file
@@ -0,0 +1,139 @@
+import click
+from datetime import date
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select, update
+from app.extensions import db
+from app.models.leave_request import LeaveRequest
+from app.models.user import User
+
+leaves_cli = AppGroup("leaves", help="Leave request maintenance commands.")
+
+
+@leaves_cli.command("recalc-days")
+@click.option("--chunk-size", default=5000, show_default=True, help="Rows fetched and updated per transaction.")
+@click.option("--include-approved", is_flag=True, help="Also rewrite APPROVED requests (ledgers are NOT adjusted).")
+@click.option("--dry-run", is_flag=True, help="Report how many rows would change without writing.")
+def recalc_days(chunk_size, include_approved, dry_run):
+    """Recompute total_days for existing leave requests with the working-day calendar."""
+    from app.services.leave_calculator import calculate_leave_days_bulk
+
+    statuses = ["PENDING", "REJECTED", "CANCELLED"]
+    if include_approved:
+        statuses.append("APPROVED")
+    sandwich = current_app.config.get("LEAVE_SANDWICH_RULE", True)
+
+    scanned = changed = 0
+    last_id = None
+
+    while True:
+        stmt = select(
+            LeaveRequest.id,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.total_days,
+            User.location
+        ).join(User, User.id == LeaveRequest.user_id).where(
+            LeaveRequest.status.in_(statuses)
+        ).order_by(LeaveRequest.id).limit(chunk_size)
+        if last_id is not None:
+            stmt = stmt.where(LeaveRequest.id > last_id)
+
+        rows = db.session.execute(stmt).all()
+        if not rows:
+            break
+
+        days = calculate_leave_days_bulk(
+            [r.start_date for r in rows],
+            [r.end_date for r in rows],
+            [r.location for r in rows],
+            sandwich=sandwich
+        )
+        updates = [
+            {"id": r.id, "total_days": d}
+            for r, d in zip(rows, days)
+            if r.total_days != d
+        ]
+
+        if updates and not dry_run:
+            # executemany UPDATE ... WHERE id = :id
+            db.session.execute(update(LeaveRequest), updates)
+            db.session.commit()
+
+        scanned += len(rows)
+        changed += len(updates)
+        last_id = rows[-1].id
+        click.echo(f"  scanned {scanned}, changed {changed}")
+
+    if changed and not dry_run:
+        # total_days feeds the monthly rollup
+        from app.services.leave_stats_service import LeaveStatsService
+        LeaveStatsService.rebuild()
+        db.session.commit()
+
+    action = "would change" if dry_run else "updated"
+    click.echo(f"✅ Recalculated {scanned} leave requests, {action} {changed}")
+
+
+stats_cli = AppGroup("stats", help="Analytics rollup maintenance commands.")
+
+
+@stats_cli.command("rebuild-monthly")
+def rebuild_monthly():
+    """Recompute leave_stats_monthly from leave_requests (backfill or repair)."""
+    from app.services.leave_stats_service import LeaveStatsService
+
+    rows = LeaveStatsService.rebuild()
+    db.session.commit()
+    click.echo(f"✅ Rebuilt leave_stats_monthly ({rows} rows)")
+
+
+ledger_cli = AppGroup("ledger", help="Leave ledger maintenance commands.")
+
+# Arbitrary constants shared by every process running these commands
+ROLLOVER_LOCK_KEY = 720_316_001
+YEAR_CLOSE_LOCK_KEY = 720_316_002
+
+
+@ledger_cli.command("rollover")
+@click.option("--year", type=int, default=lambda: date.today().year + 1, show_default="next year",
+              help="Year to create ledgers for.")
+def rollover(year):
+    """Create missing ledgers for every active user and leave type with the default quotas."""
+    from app.services.leave_ledger_service import LeaveLedgerService
+    from app.utils.sql import try_advisory_xact_lock
+
+    if not try_advisory_xact_lock(ROLLOVER_LOCK_KEY):
+        db.session.rollback()
+        raise click.ClickException("Another ledger rollover is already running")
+
+    created = LeaveLedgerService.generate_year(year)
+    db.session.commit()
+    click.echo(f"✅ Created {created} leave ledger rows for year {year}")
+
+
+@ledger_cli.command("close-year")
+@click.option("--year", type=int, default=lambda: date.today().year - 1, show_default="last year",
+              help="Year to close; balances carry into year + 1.")
+@click.option("--dry-run", is_flag=True, help="Print the report without writing.")
+def close_year(year, dry_run):
+    """Carry forward, encash and lapse unused balances of YEAR by the leave type rules."""
+    from app.services.year_close_service import YearCloseService
+    from app.utils.sql import try_advisory_xact_lock
+
+    if dry_run:
+        report = YearCloseService.summary(year)
+    else:
+        if not try_advisory_xact_lock(YEAR_CLOSE_LOCK_KEY):
+            db.session.rollback()
+            raise click.ClickException("Another year close is already running")
+        report = YearCloseService.close_year(year)
+        db.session.commit()
+
+    for row in report:
+        click.echo(
+            f"  {row['leave_type']}: {row['ledgers']} ledgers, {row['unused_days']} unused days -> "
+            f"{row['carried_forward']} carried, {row['encashed']} encashed, {row['lapsed']} lapsed"
+        )
+    action = "Would close" if dry_run else "Closed"
+    click.echo(f"✅ {action} {year} into {year + 1}")
@@ -3,8 +3,89 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() == "true"
+
+
+def engine_options(database_url):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS from DB_* environment variables (per process).
+
+    DB_POOL_MODE=pgbouncer targets PgBouncer in transaction mode: no
+    startup ``options`` (PgBouncer rejects them, so set statement_timeout on
+    the database role instead), no overflow and a short recycle.
+
+    The pool defaults to one connection per gunicorn thread (GUNICORN_THREADS)
+    plus a small overflow, so a host holds about
+    ``workers x (threads + overflow)`` Postgres connections.
+    """
+    if not database_url or database_url.startswith("sqlite"):
+        return {}
+
+    pgbouncer = os.getenv("DB_POOL_MODE", "direct") == "pgbouncer"
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", threads)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 0 if pgbouncer else 2)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        # Seconds before a pooled connection is replaced (firewalls, failover)
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 300 if pgbouncer else 1800)),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    if statement_timeout and not pgbouncer:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+
+    return options
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     if not SQLALCHEMY_DATABASE_URI:
         raise ValueError("DATABASE_URL environment variable is required")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool settings, see engine_options()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Charge weekends/holidays that fall between two leave days
+    LEAVE_SANDWICH_RULE = os.getenv("LEAVE_SANDWICH_RULE", "true").lower() == "true"
+
+    # LeaveType/Role lookup cache; set a Redis URL to share invalidations across workers
+    REFERENCE_CACHE_TTL = int(os.getenv("REFERENCE_CACHE_TTL", 300))
+    REFERENCE_CACHE_REDIS_URL = os.getenv("REFERENCE_CACHE_REDIS_URL")
+
+    # Seconds a worker may serve its cached holiday list and working-day calendar after another worker's write
+    HOLIDAY_CACHE_TTL = int(os.getenv("HOLIDAY_CACHE_TTL", 60))
+
+    # Seconds a worker trusts its cached role mask / token version for a user
+    AUTH_STATE_CACHE_TTL = int(os.getenv("AUTH_STATE_CACHE_TTL", 30))
+
+    # werkzeug hash method, e.g. "scrypt", "scrypt:16384:8:1", "pbkdf2:sha256:600000".
+    # Stored hashes with other parameters are upgraded on the next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    # >0 verifies passwords on a bounded per-process thread pool
+    PASSWORD_VERIFY_WORKERS = int(os.getenv("PASSWORD_VERIFY_WORKERS", 0))
+    PASSWORD_VERIFY_TIMEOUT = float(os.getenv("PASSWORD_VERIFY_TIMEOUT", 5))
+
+    # Who may scrape /metrics: comma-separated networks, or any client sending
+    # "Authorization: Bearer <METRICS_TOKEN>"
+    METRICS_ALLOW_FROM = os.getenv("METRICS_ALLOW_FROM", "127.0.0.0/8,::1/128")
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    # Log statements slower than this (0 = off) with an EXPLAIN plan for SELECTs.
+    # ANALYZE executes the slow statement again, so it is opt-in.
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", 500))
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "false").lower() == "true"
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 10000))
+    SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", 100))
+
+    # Logging: JSON lines (or "text") written by a background thread
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # Per-logger overrides, e.g. "app.routes.leave=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    # Fraction of DEBUG records kept when debug logging is on
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0))
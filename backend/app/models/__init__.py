@@ -6,4 +6,5 @@ from .user_role import UserRole
 from .leave_request import LeaveRequest
 from .ledger import LeaveLedger
 from .leave import Leave, LeaveType
+from .leave_stats import LeaveStatsMonthly
 
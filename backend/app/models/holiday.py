@@ -9,6 +9,10 @@ class Holiday(db.Model):
     date = db.Column(db.Date, nullable=False)
     location = db.Column(db.String(50), nullable=False)  # Pune, Ahmedabad, All
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+
+    __table_args__ = (
+        db.Index("ix_holidays_location_date", "location", "date"),
+    )
     
     def __repr__(self):
         return f"<Holiday {self.name} - {self.location} - {self.date}>"
@@ -7,6 +7,11 @@ class LeaveType(db.Model):
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = db.Column(db.String(50), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    # Opening balance for new employees and each year's rollover
+    default_quota = db.Column(db.Integer, nullable=False, default=15, server_default="15")
+    # Year close: unused days carried into next year, then encashed; the rest lapses
+    carry_forward_cap = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    encashment_cap = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
 class Leave(db.Model):
     __tablename__ = "leaves"
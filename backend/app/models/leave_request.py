@@ -1,6 +1,7 @@
 # app/models/leave_request.py
 import uuid
 from datetime import date
+from sqlalchemy import DDL, event
 from app.extensions import db
 
 class LeaveRequest(db.Model):
@@ -37,3 +38,54 @@ class LeaveRequest(db.Model):
 
     user = db.relationship("User")
     leave_type = db.relationship("LeaveType")
+
+    __table_args__ = (
+        # One request per user, leave type and exact period (any status)
+        db.Index(
+            "uq_leave_requests_user_type_dates",
+            "user_id", "leave_type_id", "start_date", "end_date",
+            unique=True
+        ),
+        # Overlap / duplicate lookups in LeaveService._conflict_message
+        db.Index(
+            "ix_leave_requests_user_status_dates",
+            "user_id", "status", "start_date", "end_date"
+        ),
+        # /leaves/my (offset and keyset pages)
+        db.Index("ix_leave_requests_user_applied_at_id", "user_id", "applied_at", "id"),
+        # /leaves/all keyset pages
+        db.Index("ix_leave_requests_applied_at_id", "applied_at", "id"),
+        # /leaves/all with a status filter
+        db.Index("ix_leave_requests_status_applied_at", "status", "applied_at"),
+        # /leaves/pending - only the (small) PENDING slice is indexed
+        db.Index(
+            "ix_leave_requests_pending_applied_at_id",
+            "applied_at", "id",
+            postgresql_where=db.text("status = 'PENDING'"),
+            sqlite_where=db.text("status = 'PENDING'")
+        ),
+        # Analytics date ranges
+        db.Index(
+            "ix_leave_requests_start_date",
+            "start_date",
+            postgresql_include=["status", "leave_type_id", "total_days"]
+        ),
+    )
+
+
+# No overlapping PENDING/APPROVED requests per user. Postgres-only (GiST
+# exclusion over a daterange); elsewhere LeaveService pre-checks overlaps.
+event.listen(
+    LeaveRequest.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql")
+)
+event.listen(
+    LeaveRequest.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE leave_requests ADD CONSTRAINT ex_leave_requests_no_overlap "
+        "EXCLUDE USING gist (user_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+        "WHERE (status IN ('PENDING', 'APPROVED'))"
+    ).execute_if(dialect="postgresql")
+)
@@ -0,0 +1,23 @@
+from app.extensions import db
+
+class LeaveStatsMonthly(db.Model):
+    """
+    Rollup of leave_requests by start month, maintained in the same
+    transaction as every status change (see LeaveStatsService).
+    """
+    __tablename__ = "leave_stats_monthly"
+
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    leave_type_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("leave_types.id"),
+        primary_key=True
+    )
+    location = db.Column(db.String(50), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+
+    leave_count = db.Column(db.Integer, nullable=False, default=0)
+    total_days = db.Column(db.Integer, nullable=False, default=0)
+
+    leave_type = db.relationship("LeaveType")
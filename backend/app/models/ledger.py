@@ -12,14 +12,27 @@ class LeaveLedger(db.Model):
 
     total_quota = db.Column(db.Integer, nullable=False)
     used_days = db.Column(db.Integer, default=0)
+    # Written by the year-close run: days brought in from last year (part of
+    # total_quota) and days of this year's balance paid out at close
+    carried_forward = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    encashed_days = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     
     user = db.relationship("User", backref="leave_ledgers")
     leave_type = db.relationship("LeaveType", backref="leave_ledgers")
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "leave_type_id", "year"),
+        # Balance invariants enforced by the database as well as the services
+        db.CheckConstraint("used_days <= total_quota", name="ck_leave_ledger_used_within_quota"),
+        db.CheckConstraint("used_days >= 0", name="ck_leave_ledger_used_nonnegative"),
+        # Balance lookups for a page of employees in a given year
+        db.Index(
+            "ix_leave_ledger_year_user",
+            "year", "user_id",
+            postgresql_include=["leave_type_id", "total_quota", "used_days"]
+        ),
     )
 
     @property
     def remaining_days(self):
-        return self.total_quota - self.used_days
\ No newline at end of file
+        return self.total_quota - (self.used_days or 0)
\ No newline at end of file
@@ -1,5 +1,5 @@
 import uuid
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import inspect
 from app.extensions import db
 
 class User(db.Model):
@@ -13,6 +13,8 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
 
     is_active = db.Column(db.Boolean, default=True)
+    # Bumped to invalidate every token issued before (e.g. on deactivation)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
     roles = db.relationship(
@@ -21,16 +23,46 @@ class User(db.Model):
         back_populates="users"
     )
 
+    __table_args__ = (
+        # Name-ordered listings (/admin/users, /leaves/employees)
+        db.Index("ix_users_full_name_id", "full_name", "id"),
+    )
+
     # ---------- password helpers ----------
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        from app.utils.passwords import hash_password
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        from app.utils.passwords import verify_password
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        from app.utils.passwords import needs_rehash
+        return needs_rehash(self.password_hash)
 
     # ---------- role helpers ----------
+    @property
+    def role_mask(self) -> int:
+        from app.utils.permissions import roles_to_mask
+
+        # Use the relationship only if it is already in memory; otherwise the
+        # cached auth state answers without lazy-loading roles.
+        if self.id is None or "roles" not in inspect(self).unloaded:
+            return roles_to_mask(r.name for r in self.roles)
+
+        from app.services.auth_state import get_auth_state
+        state = get_auth_state(self.id)
+        return state.role_mask if state else 0
+
+    @property
+    def role_names(self) -> list:
+        from app.utils.permissions import mask_to_roles
+        return mask_to_roles(self.role_mask)
+
     def has_role(self, role_name: str) -> bool:
-        return any(r.name == role_name for r in self.roles)
+        from app.utils.permissions import mask_has_role
+        return mask_has_role(self.role_mask, role_name)
 
     @property
     def is_hr(self) -> bool:
@@ -20,4 +20,6 @@ class UserRole(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "role_id", name="uq_user_role"),
+        # Role -> users lookups (e.g. User.roles.any(name="EMPLOYEE"))
+        db.Index("ix_user_roles_role_user", "role_id", "user_id"),
     )
@@ -1,10 +1,16 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 from app.models.user import User
-from app.models.role import Role
+from app.services.reference_data import reference_data
 from app.models.user_role import UserRole
-from app.utils.permissions import role_required
+from app.utils.permissions import role_required, mask_to_roles, ROLE_BITS
+from app.services.auth_state import invalidate_auth_state
+from app.services.leave_stats_service import LeaveStatsService
+from app.utils.query_options import user_listing_options
+from app.utils.pagination import paginate_request, page_meta
+from app.utils.slow_queries import slow_query_log
 from app.extensions import db
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
@@ -17,7 +23,10 @@ def get_all_users():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     
-    pagination = User.query.paginate(page=page, per_page=per_page, error_out=False)
+    query = User.query.options(
+        *user_listing_options()
+    ).order_by(User.full_name, User.id)
+    pagination = paginate_request(query, [User.full_name, User.id], per_page, page=page)
     
     return jsonify({
         "items": [
@@ -31,16 +40,13 @@ def get_all_users():
             }
             for user in pagination.items
         ],
-        "total": pagination.total,
-        "page": pagination.page,
-        "per_page": pagination.per_page,
-        "pages": pagination.pages
+        **page_meta(pagination)
     }), 200
 
 
 @admin_bp.route("/users/<uuid:user_id>/roles", methods=["POST"])
 @jwt_required()
-@role_required("ADMIN")
+@role_required("ADMIN", fresh=True)
 def assign_role(user_id):
     data = request.get_json()
     
@@ -52,42 +58,47 @@ def assign_role(user_id):
     if role_name not in ["ADMIN", "HR", "EMPLOYEE"]:
         return jsonify({"message": "Invalid role. Must be ADMIN, HR, or EMPLOYEE"}), 400
     
-    user = User.query.get_or_404(user_id)
-    role = Role.query.filter_by(name=role_name).first()
+    # Roles from the database: the auth-state cache may predate another worker's change
+    user = User.query.options(selectinload(User.roles)).filter_by(id=user_id).first_or_404()
+    role = reference_data.role_by_name(role_name)
     
     if not role:
         return jsonify({"message": "Role not found"}), 404
     
-    if user.has_role(role_name):
+    role_mask = user.role_mask
+    if role_mask & ROLE_BITS[role_name]:
         return jsonify({"message": f"User already has {role_name} role"}), 400
     
     user_role = UserRole(user_id=user.id, role_id=role.id)
     db.session.add(user_role)
     db.session.commit()
+    invalidate_auth_state(user_id)
     
     return jsonify({
         "message": f"{role_name} role assigned successfully",
-        "user_id": str(user.id),
-        "roles": [r.name for r in user.roles]
+        "user_id": str(user_id),
+        "roles": mask_to_roles(role_mask | ROLE_BITS[role_name])
     }), 200
 
 
 @admin_bp.route("/users/<uuid:user_id>/roles/<role_name>", methods=["DELETE"])
 @jwt_required()
-@role_required("ADMIN")
+@role_required("ADMIN", fresh=True)
 def remove_role(user_id, role_name):
     role_name = role_name.upper()
     
     if role_name not in ["ADMIN", "HR", "EMPLOYEE"]:
         return jsonify({"message": "Invalid role"}), 400
     
-    user = User.query.get_or_404(user_id)
-    role = Role.query.filter_by(name=role_name).first()
+    # Roles from the database: the auth-state cache may predate another worker's change
+    user = User.query.options(selectinload(User.roles)).filter_by(id=user_id).first_or_404()
+    role = reference_data.role_by_name(role_name)
     
     if not role:
         return jsonify({"message": "Role not found"}), 404
     
-    if not user.has_role(role_name):
+    role_mask = user.role_mask
+    if not role_mask & ROLE_BITS[role_name]:
         return jsonify({"message": f"User does not have {role_name} role"}), 400
     
     user_role = UserRole.query.filter_by(user_id=user.id, role_id=role.id).first()
@@ -95,17 +106,18 @@ def remove_role(user_id, role_name):
     if user_role:
         db.session.delete(user_role)
         db.session.commit()
+        invalidate_auth_state(user_id)
     
     return jsonify({
         "message": f"{role_name} role removed successfully",
-        "user_id": str(user.id),
-        "roles": [r.name for r in user.roles]
+        "user_id": str(user_id),
+        "roles": mask_to_roles(role_mask & ~ROLE_BITS[role_name])
     }), 200
 
 
 @admin_bp.route("/users/<uuid:user_id>/status", methods=["PATCH"])
 @jwt_required()
-@role_required("ADMIN")
+@role_required("ADMIN", fresh=True)
 def update_user_status(user_id):
     data = request.get_json()
     
@@ -113,8 +125,13 @@ def update_user_status(user_id):
         return jsonify({"message": "is_active is required"}), 400
     
     user = User.query.get_or_404(user_id)
-    user.is_active = bool(data["is_active"])
+    is_active = bool(data["is_active"])
+    if user.is_active != is_active:
+        # Revokes every token issued before this change
+        user.token_version = (user.token_version or 0) + 1
+    user.is_active = is_active
     db.session.commit()
+    invalidate_auth_state(user_id)
     
     return jsonify({
         "message": "User status updated successfully",
@@ -125,7 +142,7 @@ def update_user_status(user_id):
 
 @admin_bp.route("/users/<uuid:user_id>/location", methods=["PATCH"])
 @jwt_required()
-@role_required("ADMIN")
+@role_required("ADMIN", fresh=True)
 def update_user_location(user_id):
     data = request.get_json()
     
@@ -136,6 +153,8 @@ def update_user_location(user_id):
         return jsonify({"message": "Invalid location. Must be Pune or Ahmedabad"}), 400
     
     user = User.query.get_or_404(user_id)
+    # The analytics rollup is keyed by the user's location: move their rows too
+    LeaveStatsService.move_user(user.id, user.location, data["location"])
     user.location = data["location"]
     db.session.commit()
     
@@ -144,3 +163,13 @@ def update_user_location(user_id):
         "user_id": str(user.id),
         "location": user.location
     }), 200
+
+
+@admin_bp.route("/diagnostics/slow-queries", methods=["GET"])
+@jwt_required()
+@role_required("ADMIN")
+def slow_queries():
+    return jsonify({
+        "threshold_ms": round(slow_query_log.threshold * 1000),
+        "items": slow_query_log.snapshot()
+    }), 200
@@ -3,9 +3,10 @@ from flask_jwt_extended import jwt_required
 from app.utils.permissions import role_required
 from app.models.leave_request import LeaveRequest
 from app.models.leave import LeaveType
+from app.models.leave_stats import LeaveStatsMonthly
 from app.extensions import db
-from sqlalchemy import func, extract
-from datetime import datetime
+from sqlalchemy import func, and_, or_, select
+from datetime import datetime, date
 
 analytics_bp = Blueprint("analytics", __name__, url_prefix="/analytics")
 
@@ -18,13 +19,15 @@ def leave_trends():
     year = request.args.get('year', datetime.now().year, type=int)
     
     trends = db.session.query(
-        extract('month', LeaveRequest.start_date).label('month'),
-        func.count(LeaveRequest.id).label('count'),
-        func.sum(LeaveRequest.total_days).label('total_days')
+        LeaveStatsMonthly.month.label('month'),
+        func.sum(LeaveStatsMonthly.leave_count).label('count'),
+        func.sum(LeaveStatsMonthly.total_days).label('total_days')
     ).filter(
-        extract('year', LeaveRequest.start_date) == year,
-        LeaveRequest.status == 'APPROVED'
-    ).group_by('month').order_by('month').all()
+        LeaveStatsMonthly.year == year,
+        LeaveStatsMonthly.status == 'APPROVED'
+    ).group_by(LeaveStatsMonthly.month).having(
+        func.sum(LeaveStatsMonthly.leave_count) > 0
+    ).order_by(LeaveStatsMonthly.month).all()
     
     return jsonify([
         {
@@ -43,11 +46,13 @@ def leave_types_stats():
     """Most used leave types"""
     stats = db.session.query(
         LeaveType.name,
-        func.count(LeaveRequest.id).label('count'),
-        func.sum(LeaveRequest.total_days).label('total_days')
-    ).join(LeaveRequest).filter(
-        LeaveRequest.status == 'APPROVED'
-    ).group_by(LeaveType.name).all()
+        func.sum(LeaveStatsMonthly.leave_count).label('count'),
+        func.sum(LeaveStatsMonthly.total_days).label('total_days')
+    ).join(LeaveStatsMonthly, LeaveStatsMonthly.leave_type_id == LeaveType.id).filter(
+        LeaveStatsMonthly.status == 'APPROVED'
+    ).group_by(LeaveType.name).having(
+        func.sum(LeaveStatsMonthly.leave_count) > 0
+    ).all()
     
     return jsonify([
         {
@@ -63,14 +68,22 @@ def leave_types_stats():
 @jwt_required()
 @role_required("HR")
 def peak_periods():
-    """Peak leave periods"""
+    """
+    Peak leave periods.
+
+    Ranks individual start dates, which the monthly rollup cannot answer,
+    so this reads leave_requests directly: one year of APPROVED rows via
+    ix_leave_requests_start_date, grouped by day.
+    """
     year = request.args.get('year', datetime.now().year, type=int)
     
     peaks = db.session.query(
         LeaveRequest.start_date,
         func.count(LeaveRequest.id).label('count')
     ).filter(
-        extract('year', LeaveRequest.start_date) == year,
+        # Half-open range so ix_leave_requests_start_date can be used
+        LeaveRequest.start_date >= date(year, 1, 1),
+        LeaveRequest.start_date < date(year + 1, 1, 1),
         LeaveRequest.status == 'APPROVED'
     ).group_by(LeaveRequest.start_date).order_by(
         func.count(LeaveRequest.id).desc()
@@ -89,27 +102,82 @@ def peak_periods():
 @jwt_required()
 @role_required("HR")
 def analytics_summary():
-    """Overall analytics summary"""
+    """Overall analytics summary, optionally broken down by location and/or leave type"""
     from app.models.user import User
+    from app.models.role import Role
     
-    total_employees = User.query.filter(User.roles.any(name='EMPLOYEE')).count()
+    year = request.args.get('year', datetime.now().year, type=int)
+    breakdown = [
+        b.strip() for b in request.args.get('breakdown', '', type=str).split(',') if b.strip()
+    ]
+    if any(b not in ('location', 'leave_type') for b in breakdown):
+        return jsonify({"message": "breakdown must be location and/or leave_type"}), 400
     
-    current_year = datetime.now().year
-    total_leaves = LeaveRequest.query.filter(
-        extract('year', LeaveRequest.start_date) == current_year
-    ).count()
+    # Half-open range instead of extract('year', ...) so the start_date index applies
+    in_year = and_(
+        LeaveRequest.start_date >= date(year, 1, 1),
+        LeaveRequest.start_date < date(year + 1, 1, 1)
+    )
+    is_pending = LeaveRequest.status == 'PENDING'
     
-    approved_leaves = LeaveRequest.query.filter(
-        extract('year', LeaveRequest.start_date) == current_year,
-        LeaveRequest.status == 'APPROVED'
-    ).count()
+    total_employees = select(func.count(User.id)).where(
+        User.roles.any(Role.name == 'EMPLOYEE')
+    ).scalar_subquery()
+    
+    group_columns = []
+    query = db.session.query(
+        total_employees.label('total_employees'),
+        func.count(LeaveRequest.id).filter(in_year).label('total_leaves'),
+        func.count(LeaveRequest.id).filter(
+            in_year, LeaveRequest.status == 'APPROVED'
+        ).label('approved_leaves'),
+        func.count(LeaveRequest.id).filter(is_pending).label('pending_leaves')
+    ).filter(or_(in_year, is_pending))
+    
+    if 'location' in breakdown:
+        query = query.join(User, User.id == LeaveRequest.user_id)
+        group_columns.append(User.location.label('location'))
+    if 'leave_type' in breakdown:
+        query = query.join(LeaveType, LeaveType.id == LeaveRequest.leave_type_id)
+        group_columns.append(LeaveType.name.label('leave_type'))
     
-    pending_leaves = LeaveRequest.query.filter_by(status='PENDING').count()
+    if group_columns:
+        query = query.add_columns(*group_columns).group_by(*[c.element for c in group_columns])
     
-    return jsonify({
-        "total_employees": total_employees,
+    rows = query.all()
+    
+    if rows:
+        employees = rows[0].total_employees
+    else:
+        # Grouped query over no leave rows returns nothing
+        employees = db.session.query(total_employees).scalar()
+    
+    total_leaves = sum(r.total_leaves for r in rows)
+    approved_leaves = sum(r.approved_leaves for r in rows)
+    pending_leaves = sum(r.pending_leaves for r in rows)
+    
+    result = {
+        "total_employees": employees,
         "total_leaves": total_leaves,
         "approved_leaves": approved_leaves,
         "pending_leaves": pending_leaves,
-        "approval_rate": round((approved_leaves / total_leaves * 100) if total_leaves > 0 else 0, 2)
-    }), 200
+        "approval_rate": _approval_rate(approved_leaves, total_leaves)
+    }
+    
+    if group_columns:
+        result["breakdown"] = [
+            {
+                **{b: getattr(r, b) for b in breakdown},
+                "total_leaves": r.total_leaves,
+                "approved_leaves": r.approved_leaves,
+                "pending_leaves": r.pending_leaves,
+                "approval_rate": _approval_rate(r.approved_leaves, r.total_leaves)
+            }
+            for r in rows
+        ]
+    
+    return jsonify(result), 200
+
+
+def _approval_rate(approved, total):
+    return round((approved / total * 100) if total > 0 else 0, 2)
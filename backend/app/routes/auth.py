@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
 from flask_cors import cross_origin
 from app.models.user import User
+from app.extensions import db
+from app.utils.passwords import PasswordVerifierBusy
+from app.utils.permissions import mask_to_roles
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -21,16 +24,30 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not user.check_password(password):
-        return jsonify({"message": "Invalid credentials"}), 401
+    try:
+        if not user or not user.check_password(password):
+            return jsonify({"message": "Invalid credentials"}), 401
+    except PasswordVerifierBusy:
+        return jsonify({"message": "Login is busy. Please try again."}), 503
 
     if not user.is_active:
         return jsonify({"message": "Access expired. Contact admin for details."}), 403
 
+    # Hash parameters changed since this password was stored: upgrade it now
+    # while the plaintext is available.
+    if user.password_needs_rehash():
+        user.set_password(password)
+        db.session.commit()
+
+    roles = mask_to_roles(user.role_mask)
+
+    # Authorization reads roles from the auth-state cache (invalidated on role
+    # changes), so the token carries no role mask of its own
     access_token = create_access_token(
         identity=str(user.id),
         additional_claims={
-            "roles": [role.name for role in user.roles]
+            "roles": roles,
+            "tv": user.token_version or 0
         }
     )
 
@@ -39,6 +56,6 @@ def login():
         "user": {
             "email": user.email,
             "full_name": user.full_name,
-            "roles": [r.name for r in user.roles]
+            "roles": roles
         }
     }), 200
\ No newline at end of file
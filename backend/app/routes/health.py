@@ -0,0 +1,27 @@
+import time
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+from app.extensions import db
+from app.utils.pool_telemetry import pool_stats
+
+health_bp = Blueprint("health", __name__, url_prefix="/healthz")
+
+
+@health_bp.route("/db", methods=["GET"])
+def db_health():
+    """Round trip to the database plus this process's connection pool state (no auth, for probes)."""
+    start = time.perf_counter()
+    try:
+        db.session.execute(text("SELECT 1"))
+        status, code = "ok", 200
+    except Exception as e:
+        current_app.logger.warning("Database health check failed: %s", e)
+        db.session.rollback()
+        status, code = "unavailable", 503
+    latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    return jsonify({
+        "status": status,
+        "latency_ms": latency_ms,
+        "pool": pool_stats.snapshot(db.engine.pool)
+    }), code
@@ -4,6 +4,7 @@ from datetime import datetime
 from uuid import UUID
 from app.models.holiday import Holiday
 from app.utils.permissions import role_required
+from app.services.holiday_cache import holiday_cache, holidays_changed
 from app.extensions import db
 
 holiday_bp = Blueprint("holiday", __name__, url_prefix="/holidays")
@@ -12,29 +13,37 @@ holiday_bp = Blueprint("holiday", __name__, url_prefix="/holidays")
 @holiday_bp.route("", methods=["GET"])
 @jwt_required()
 def get_holidays():
-    """Get all holidays or filter by location"""
+    """Get all holidays or filter by location and date range"""
     location = request.args.get('location', None)
+    year = request.args.get('year', None, type=int)
+    date_from = request.args.get('from', None)
+    date_to = request.args.get('to', None)
     
-    query = Holiday.query
-    if location and location != 'All':
-        query = query.filter((Holiday.location == location) | (Holiday.location == 'All'))
+    try:
+        if date_from:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date().isoformat()
+        if date_to:
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date().isoformat()
+    except ValueError:
+        return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
     
-    holidays = query.order_by(Holiday.date.desc()).all()
+    if year:
+        date_from = max(date_from or '', f"{year:04d}-01-01")
+        date_to = min(date_to or '9999-12-31', f"{year:04d}-12-31")
     
-    return jsonify([
-        {
-            "id": str(h.id),
-            "name": h.name,
-            "date": h.date.isoformat(),
-            "location": h.location
-        }
-        for h in holidays
-    ]), 200
+    holidays = holiday_cache.get(location)
+    
+    response = jsonify(holidays.filtered(date_from, date_to))
+    # ETag only: a per-process Last-Modified would disagree between workers
+    response.set_etag(holidays.etag(date_from, date_to))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    
+    return response.make_conditional(request)
 
 
 @holiday_bp.route("", methods=["POST"])
 @jwt_required()
-@role_required("ADMIN")
+@role_required("ADMIN", fresh=True)
 def create_holiday():
     """Create a new holiday"""
     data = request.get_json()
@@ -59,6 +68,7 @@ def create_holiday():
     
     db.session.add(holiday)
     db.session.commit()
+    holidays_changed()
     
     return jsonify({
         "message": "Holiday created successfully",
@@ -73,12 +83,13 @@ def create_holiday():
 
 @holiday_bp.route("/<uuid:holiday_id>", methods=["DELETE"])
 @jwt_required()
-@role_required("ADMIN")
+@role_required("ADMIN", fresh=True)
 def delete_holiday(holiday_id):
     """Delete a holiday"""
     holiday = Holiday.query.get_or_404(holiday_id)
     
     db.session.delete(holiday)
     db.session.commit()
+    holidays_changed()
     
     return jsonify({"message": "Holiday deleted successfully"}), 200
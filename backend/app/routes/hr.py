@@ -2,9 +2,14 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.utils.permissions import role_required
 from app.models.user import User
-from app.models.role import Role
+from app.models.user_role import UserRole
 from app.models.ledger import LeaveLedger
-from app.models.leave import LeaveType
+from app.services.reference_data import reference_data
+from app.services.employee_import import (
+    EmployeeImportError,
+    EmployeeImportService,
+    parse_csv
+)
 from app.extensions import db
 from datetime import datetime
 
@@ -31,36 +36,30 @@ def create_employee():
     if User.query.filter_by(email=email).first():
         return jsonify({"message": "Email already exists"}), 400
     
-    employee_role = Role.query.filter_by(name="EMPLOYEE").first()
+    employee_role = reference_data.role_by_name("EMPLOYEE")
     if not employee_role:
         return jsonify({"message": "Employee role not found"}), 500
     
     new_user = User(email=email, full_name=full_name)
     new_user.set_password(password)
-    new_user.roles.append(employee_role)
     
     db.session.add(new_user)
     db.session.flush()
+    db.session.add(UserRole(user_id=new_user.id, role_id=employee_role.id))
     
     current_year = datetime.utcnow().year
-    leave_types = LeaveType.query.all()
+    leave_types = reference_data.leave_types()
     
     if not leave_types:
         db.session.rollback()
         return jsonify({"message": "No leave types found. Please contact administrator."}), 500
     
-    leave_quotas = {
-        "Planned Leave": 18,
-        "Emergency Leave": 5
-    }
-    
     for leave_type in leave_types:
-        quota = leave_quotas.get(leave_type.name, 15)
         ledger = LeaveLedger(
             user_id=new_user.id,
             leave_type_id=leave_type.id,
             year=current_year,
-            total_quota=quota,
+            total_quota=leave_type.default_quota,
             used_days=0
         )
         db.session.add(ledger)
@@ -73,3 +72,36 @@ def create_employee():
         "email": new_user.email,
         "full_name": new_user.full_name
     }), 201
+
+
+@hr_bp.route("/employees/import", methods=["POST"])
+@jwt_required()
+@role_required("HR")
+def import_employees():
+    upload = request.files.get("file")
+    
+    try:
+        if upload:
+            rows = parse_csv(upload.read().decode("utf-8-sig"))
+        elif request.mimetype == "text/csv":
+            rows = parse_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True)
+            rows = data.get("employees") if isinstance(data, dict) else data
+            if not isinstance(rows, list):
+                return jsonify({"message": "Send a CSV file or a JSON array of employees"}), 400
+        
+        results = EmployeeImportService.import_employees(rows)
+    except UnicodeDecodeError:
+        return jsonify({"message": "CSV file must be UTF-8 encoded"}), 400
+    except EmployeeImportError as e:
+        return jsonify({"message": str(e)}), 400
+    
+    created = sum(1 for r in results if r["status"] == "created")
+    
+    return jsonify({
+        "message": f"Imported {created} of {len(results)} employees",
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }), 201 if created else 200
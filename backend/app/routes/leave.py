@@ -1,31 +1,44 @@
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, date
 from uuid import UUID
+from sqlalchemy.orm import joinedload
 from app.services.leave_service import LeaveService
+from app.services.leave_ledger_service import LeaveLedgerService, LedgerNotFound
 from app.services.leave_calculator import validate_leave_dates
+from app.services.reference_data import reference_data
+from app.services.leave_export import export_statement, stream_csv, stream_ndjson
 from app.models.ledger import LeaveLedger
 from app.models.leave_request import LeaveRequest
+from app.models.leave import LeaveType
+from app.models.user import User
 from app.utils.permissions import role_required
+from app.utils.query_options import leave_listing_query
+from app.utils.pagination import paginate_request, page_meta, InvalidCursor
 from app.extensions import db
 
 leave_bp = Blueprint("leave", __name__, url_prefix="/leaves")
+logger = logging.getLogger(__name__)
 
 
 # ---------------- EMPLOYEE ----------------
 @leave_bp.route("/types", methods=["GET"])
 @jwt_required()
 def get_leave_types():
-    from app.models.leave import LeaveType
-    leave_types = LeaveType.query.all()
+    snapshot = reference_data.leave_types_snapshot()
     
-    return jsonify([
+    response = jsonify([
         {
             "id": str(lt.id),
             "name": lt.name
         }
-        for lt in leave_types
-    ]), 200
+        for lt in snapshot.rows
+    ])
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    
+    return response.make_conditional(request)
 
 
 @leave_bp.route("/apply", methods=["POST"])
@@ -52,6 +65,11 @@ def apply_leave():
     except ValueError:
         return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
 
+    try:
+        data["leave_type_id"] = UUID(str(data["leave_type_id"]))
+    except ValueError:
+        return jsonify({"message": "Invalid leave_type_id"}), 400
+
     # Validate dates are not in the past
     today = date.today()
     if data["start_date"] < today:
@@ -95,13 +113,28 @@ def my_leaves():
     status_filter = request.args.get('status', 'all', type=str).lower()
     sort_by = request.args.get('sort', 'date_desc', type=str)
     
-    print(f"DEBUG: Filters - status={status_filter}, sort={sort_by}, page={page}")
+    logger.debug(
+        "my_leaves filters",
+        extra={"status_filter": status_filter, "sort": sort_by, "page": page}
+    )
     
-    query = LeaveRequest.query.filter_by(user_id=user_id)
+    leave_id = LeaveRequest.id.label("leave_id")
+    query = leave_listing_query(
+        leave_id,
+        LeaveType.name.label("leave_type"),
+        LeaveRequest.status,
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.total_days,
+        LeaveRequest.reason,
+        LeaveRequest.rejection_reason,
+        LeaveRequest.applied_at,
+        LeaveRequest.processed_at
+    ).filter(LeaveRequest.user_id == user_id)
     
     # Apply status filter
     if status_filter != 'all':
-        query = query.filter_by(status=status_filter.upper())
+        query = query.filter(LeaveRequest.status == status_filter.upper())
     
     # Apply sorting
     if sort_by == 'date_asc':
@@ -109,30 +142,22 @@ def my_leaves():
     else:  # date_desc (default)
         query = query.order_by(LeaveRequest.applied_at.desc())
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate_request(
+        query,
+        [LeaveRequest.applied_at, leave_id],
+        per_page,
+        page=page,
+        descending=sort_by != 'date_asc'
+    )
     
-    print(f"DEBUG: Found {pagination.total} total items, {len(pagination.items)} on this page")
+    logger.debug(
+        "my_leaves page",
+        extra={"total": pagination.total, "page_items": len(pagination.items)}
+    )
 
     response = jsonify({
-        "items": [
-            {
-                "leave_id": str(l.id),
-                "leave_type": l.leave_type.name,
-                "status": l.status,
-                "start_date": l.start_date.isoformat(),
-                "end_date": l.end_date.isoformat(),
-                "total_days": l.total_days,
-                "reason": l.reason,
-                "rejection_reason": l.rejection_reason,
-                "applied_at": l.applied_at.isoformat() if l.applied_at else None,
-                "processed_at": l.processed_at.isoformat() if l.processed_at else None
-            }
-            for l in pagination.items
-        ],
-        "total": pagination.total,
-        "page": pagination.page,
-        "per_page": pagination.per_page,
-        "pages": pagination.pages
+        "items": [row._asdict() for row in pagination.items],
+        **page_meta(pagination)
     })
     
     response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
@@ -163,7 +188,8 @@ def my_balance():
             "leave_type": ledger.leave_type.name,
             "total_quota": ledger.total_quota,
             "used_days": ledger.used_days,
-            "remaining_days": ledger.remaining_days
+            "remaining_days": ledger.remaining_days,
+            "carried_forward": ledger.carried_forward
         })
 
     return jsonify(result), 200
@@ -175,46 +201,50 @@ def my_balance():
 @jwt_required()
 @role_required("HR")
 def get_employees():
-    from app.models.user import User
+    from app.models.role import Role
     current_year = datetime.utcnow().year
     
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     
-    pagination = User.query.paginate(page=page, per_page=per_page, error_out=False)
+    # Role filter runs in SQL so totals/pages only count employees
+    query = User.query.filter(
+        User.roles.any(Role.name == "EMPLOYEE")
+    ).order_by(User.full_name, User.id)
+    pagination = paginate_request(query, [User.full_name, User.id], per_page, page=page)
     
-    result = []
-    for emp in pagination.items:
-        if not emp.is_employee:
-            continue
-            
-        ledgers = LeaveLedger.query.filter_by(
-            user_id=emp.id,
-            year=current_year
+    # One batched ledger fetch for the whole page instead of one per employee
+    balances = {emp.id: [] for emp in pagination.items}
+    if balances:
+        ledgers = LeaveLedger.query.options(
+            joinedload(LeaveLedger.leave_type)
+        ).filter(
+            LeaveLedger.user_id.in_(balances.keys()),
+            LeaveLedger.year == current_year
         ).all()
         
-        result.append({
+        for l in ledgers:
+            balances[l.user_id].append({
+                "leave_type_id": str(l.leave_type.id),
+                "leave_type": l.leave_type.name,
+                "total_quota": l.total_quota,
+                "used_days": l.used_days,
+                "remaining_days": l.remaining_days
+            })
+    
+    result = [
+        {
             "user_id": str(emp.id),
             "full_name": emp.full_name,
             "email": emp.email,
-            "leave_balances": [
-                {
-                    "leave_type_id": str(l.leave_type.id),
-                    "leave_type": l.leave_type.name,
-                    "total_quota": l.total_quota,
-                    "used_days": l.used_days,
-                    "remaining_days": l.remaining_days
-                }
-                for l in ledgers
-            ]
-        })
+            "leave_balances": balances[emp.id]
+        }
+        for emp in pagination.items
+    ]
     
     return jsonify({
         "items": result,
-        "total": pagination.total,
-        "page": pagination.page,
-        "per_page": pagination.per_page,
-        "pages": pagination.pages
+        **page_meta(pagination)
     }), 200
 
 
@@ -222,15 +252,27 @@ def get_employees():
 @jwt_required()
 @role_required("HR")
 def all_leaves():
-    from app.models.user import User
-    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     status_filter = request.args.get('status', 'all', type=str).lower()
     sort_by = request.args.get('sort', 'date_desc', type=str)
     search = request.args.get('search', '', type=str).strip()
     
-    query = LeaveRequest.query.join(User)
+    leave_id = LeaveRequest.id.label("leave_id")
+    query = leave_listing_query(
+        leave_id,
+        User.full_name.label("employee_name"),
+        User.email.label("employee_email"),
+        LeaveType.name.label("leave_type"),
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.total_days,
+        LeaveRequest.status,
+        LeaveRequest.reason,
+        LeaveRequest.rejection_reason,
+        LeaveRequest.applied_at,
+        LeaveRequest.processed_at
+    )
     
     # Apply status filter
     if status_filter != 'all':
@@ -246,30 +288,17 @@ def all_leaves():
     else:  # date_desc (default)
         query = query.order_by(LeaveRequest.applied_at.desc())
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate_request(
+        query,
+        [LeaveRequest.applied_at, leave_id],
+        per_page,
+        page=page,
+        descending=sort_by != 'date_asc'
+    )
     
     return jsonify({
-        "items": [
-            {
-                "leave_id": str(l.id),
-                "employee_name": l.user.full_name,
-                "employee_email": l.user.email,
-                "leave_type": l.leave_type.name,
-                "start_date": l.start_date.isoformat(),
-                "end_date": l.end_date.isoformat(),
-                "total_days": l.total_days,
-                "status": l.status,
-                "reason": l.reason,
-                "rejection_reason": l.rejection_reason,
-                "applied_at": l.applied_at.isoformat() if l.applied_at else None,
-                "processed_at": l.processed_at.isoformat() if l.processed_at else None
-            }
-            for l in pagination.items
-        ],
-        "total": pagination.total,
-        "page": pagination.page,
-        "per_page": pagination.per_page,
-        "pages": pagination.pages
+        "items": [row._asdict() for row in pagination.items],
+        **page_meta(pagination)
     }), 200
 
 
@@ -281,34 +310,78 @@ def pending_leaves():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         
-        pagination = LeaveRequest.query.filter_by(status="PENDING").order_by(
+        leave_id = LeaveRequest.id.label("leave_id")
+        query = leave_listing_query(
+            leave_id,
+            User.full_name.label("employee_name"),
+            LeaveRequest.user_id.label("employee_id"),
+            User.location.label("employee_location"),
+            LeaveType.name.label("leave_type"),
+            LeaveRequest.leave_type_id,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.total_days,
+            LeaveRequest.reason,
+            LeaveRequest.applied_at
+        ).filter(LeaveRequest.status == "PENDING").order_by(
             LeaveRequest.applied_at.desc()
-        ).paginate(page=page, per_page=per_page, error_out=False)
+        )
+        pagination = paginate_request(
+            query,
+            [LeaveRequest.applied_at, leave_id],
+            per_page,
+            page=page,
+            descending=True
+        )
 
         return jsonify({
-            "items": [
-                {
-                    "leave_id": str(l.id),
-                    "employee_name": l.user.full_name,
-                    "employee_id": str(l.user.id),
-                    "employee_location": l.user.location,
-                    "leave_type": l.leave_type.name,
-                    "leave_type_id": str(l.leave_type.id),
-                    "start_date": l.start_date.isoformat(),
-                    "end_date": l.end_date.isoformat(),
-                    "total_days": l.total_days,
-                    "reason": l.reason
-                }
-                for l in pagination.items
-            ],
-            "total": pagination.total,
-            "page": pagination.page,
-            "per_page": pagination.per_page,
-            "pages": pagination.pages
+            "items": [row._asdict() for row in pagination.items],
+            **page_meta(pagination)
         }), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@leave_bp.route("/export", methods=["GET"])
+@jwt_required()
+@role_required("HR")
+def export_leaves():
+    """Stream leave requests as CSV or NDJSON for payroll/audit"""
+    export_format = request.args.get('format', 'csv', type=str).lower()
+    status_filter = request.args.get('status', 'all', type=str).upper()
+    
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({"message": "format must be csv or ndjson"}), 400
+    
+    try:
+        date_from = request.args.get('from')
+        date_to = request.args.get('to')
+        date_from = datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None
+        date_to = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else None
+    except ValueError:
+        return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    stmt = export_statement(
+        date_from=date_from,
+        date_to=date_to,
+        status=None if status_filter == 'ALL' else status_filter
+    )
+    
+    if export_format == 'csv':
+        body, mimetype = stream_csv(stmt), "text/csv"
+    else:
+        body, mimetype = stream_ndjson(stmt), "application/x-ndjson"
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename=leaves.{export_format}",
+            "Cache-Control": "no-store"
+        }
+    )
+
 @leave_bp.route("/update-quota", methods=["POST"])
 @jwt_required()
 @role_required("HR")
@@ -326,29 +399,21 @@ def update_quota():
     except (ValueError, TypeError):
         return jsonify({"message": "Invalid user_id, leave_type_id, or new_quota"}), 400
 
-    current_year = datetime.utcnow().year
-
-    ledger = LeaveLedger.query.filter_by(
-        user_id=user_id,
-        leave_type_id=leave_type_id,
-        year=current_year
-    ).first()
-
-    if not ledger:
-        return jsonify({"message": "Leave ledger not found"}), 404
-
-    if new_quota < ledger.used_days:
-        return jsonify({
-            "message": "New quota cannot be less than already used days"
-        }), 400
+    try:
+        ledger = LeaveLedgerService.update_quota(
+            user_id, leave_type_id, datetime.utcnow().year, new_quota
+        )
+    except LedgerNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    ledger.total_quota = new_quota
     db.session.commit()
 
     return jsonify({
         "message": "Quota updated successfully",
         "total_quota": ledger.total_quota,
-        "remaining_days": ledger.remaining_days
+        "remaining_days": ledger.total_quota - ledger.used_days
     }), 200
 
 
@@ -369,37 +434,74 @@ def adjust_quota():
     except (ValueError, TypeError):
         return jsonify({"message": "Invalid user_id, leave_type_id, or adjustment"}), 400
 
-    current_year = datetime.utcnow().year
+    try:
+        ledger = LeaveLedgerService.adjust_quota(
+            user_id, leave_type_id, datetime.utcnow().year, adjustment
+        )
+    except LedgerNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    ledger = LeaveLedger.query.filter_by(
-        user_id=user_id,
-        leave_type_id=leave_type_id,
-        year=current_year
-    ).first()
+    db.session.commit()
 
-    if not ledger:
-        return jsonify({"message": "Leave ledger not found"}), 404
+    return jsonify({
+        "message": f"Quota adjusted successfully by {adjustment:+d} days",
+        "total_quota": ledger.total_quota,
+        "remaining_days": ledger.total_quota - ledger.used_days
+    }), 200
 
-    new_quota = ledger.total_quota + adjustment
 
-    if new_quota < ledger.used_days:
-        return jsonify({
-            "message": f"Cannot adjust quota. New quota ({new_quota}) would be less than already used days ({ledger.used_days})"
-        }), 400
 
-    if new_quota < 0:
-        return jsonify({"message": "Quota cannot be negative"}), 400
+MAX_BULK_ITEMS = 500
+
+
+def _parse_bulk_ids(data):
+    leave_ids = data.get("leave_ids")
+    if not isinstance(leave_ids, list) or not leave_ids:
+        return None, "leave_ids must be a non-empty list"
+    if len(leave_ids) > MAX_BULK_ITEMS:
+        return None, f"At most {MAX_BULK_ITEMS} leave_ids per request"
+    try:
+        # dict.fromkeys dedupes while keeping request order
+        return list(dict.fromkeys(UUID(str(lid)) for lid in leave_ids)), None
+    except ValueError:
+        return None, "Invalid leave_id in leave_ids"
 
-    ledger.total_quota = new_quota
-    db.session.commit()
 
+def _bulk_response(results):
+    failed = sum(1 for r in results if "error" in r)
     return jsonify({
-        "message": f"Quota adjusted successfully by {adjustment:+d} days",
-        "total_quota": ledger.total_quota,
-        "remaining_days": ledger.remaining_days
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed
     }), 200
 
 
+@leave_bp.route("/bulk-approve", methods=["POST"])
+@jwt_required()
+@role_required("HR")
+def bulk_approve():
+    leave_ids, error = _parse_bulk_ids(request.get_json() or {})
+    if error:
+        return jsonify({"message": error}), 400
+    
+    return _bulk_response(LeaveService.bulk_approve(leave_ids))
+
+
+@leave_bp.route("/bulk-reject", methods=["POST"])
+@jwt_required()
+@role_required("HR")
+def bulk_reject():
+    data = request.get_json() or {}
+    leave_ids, error = _parse_bulk_ids(data)
+    if error:
+        return jsonify({"message": error}), 400
+    
+    return _bulk_response(
+        LeaveService.bulk_reject(leave_ids, data.get("rejection_reason"))
+    )
+
 
 @leave_bp.route("/<uuid:leave_id>/approve", methods=["POST"])
 @jwt_required()
@@ -441,7 +543,7 @@ def cancel_leave(leave_id):
         identity = get_jwt_identity()
         user_id = identity if isinstance(identity, UUID) else UUID(identity)
         
-        print(f"DEBUG: Attempting to cancel leave {leave_id} for user {user_id}")
+        logger.info("Cancelling leave", extra={"leave_id": str(leave_id), "user_id": str(user_id)})
         
         leave = LeaveService.cancel_leave(leave_id, user_id)
         
@@ -452,11 +554,9 @@ def cancel_leave(leave_id):
         }), 200
     
     except ValueError as e:
-        print(f"DEBUG: ValueError in cancel_leave: {str(e)}")
+        logger.info("Leave cancel rejected: %s", e, extra={"leave_id": str(leave_id)})
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"DEBUG: Exception in cancel_leave: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to cancel leave", extra={"leave_id": str(leave_id)})
         return jsonify({"error": f"Failed to cancel leave: {str(e)}"}), 500
 
@@ -0,0 +1,34 @@
+import hmac
+import ipaddress
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.utils.metrics import request_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _scrape_allowed():
+    """Loopback / METRICS_ALLOW_FROM networks, or a matching METRICS_TOKEN bearer token."""
+    token = current_app.config.get("METRICS_TOKEN")
+    auth = request.headers.get("Authorization", "")
+    if token and auth.startswith("Bearer ") and hmac.compare_digest(auth[7:], token):
+        return True
+
+    try:
+        address = ipaddress.ip_address(request.remote_addr or "")
+    except ValueError:
+        return False
+    networks = current_app.config.get("METRICS_ALLOW_FROM", "127.0.0.0/8,::1/128")
+    return any(
+        address in ipaddress.ip_network(cidr.strip(), strict=False)
+        for cidr in networks.split(",") if cidr.strip()
+    )
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus text exposition of the request histograms (scrapers only)."""
+    if not _scrape_allowed():
+        return jsonify({"message": "Forbidden"}), 403
+
+    body, content_type = request_metrics.render()
+    return Response(body, content_type=content_type)
@@ -0,0 +1,75 @@
+from collections import namedtuple
+from uuid import UUID
+from app.extensions import db
+from app.models.user import User
+from app.models.role import Role
+from app.models.user_role import UserRole
+from app.utils.cache import TTLCache
+from app.utils.permissions import roles_to_mask
+
+UserAuthState = namedtuple("UserAuthState", ["role_mask", "token_version", "is_active"])
+
+# Per-process; the TTL bounds how long another worker's role/status change takes to apply here
+_auth_states = TTLCache(ttl=30, maxsize=50000)
+
+
+def init_app(app):
+    _auth_states.ttl = app.config.get("AUTH_STATE_CACHE_TTL", 30)
+
+
+def load_auth_state(user_id):
+    rows = db.session.query(
+        User.is_active,
+        User.token_version,
+        Role.name
+    ).outerjoin(
+        UserRole, UserRole.user_id == User.id
+    ).outerjoin(
+        Role, Role.id == UserRole.role_id
+    ).filter(User.id == user_id).all()
+
+    if not rows:
+        return None
+
+    return UserAuthState(
+        role_mask=roles_to_mask(r.name for r in rows if r.name),
+        token_version=rows[0].token_version or 0,
+        is_active=bool(rows[0].is_active)
+    )
+
+
+def get_auth_state(user_id):
+    state = _auth_states.get(user_id)
+    if state is None:
+        state = load_auth_state(user_id)
+        if state is not None:
+            _auth_states.set(user_id, state)
+    return state
+
+
+def refresh_auth_state(user_id):
+    """Read the state from the database, bypassing and then replacing the cached entry."""
+    state = load_auth_state(user_id)
+    if state is None:
+        _auth_states.invalidate(user_id)
+    else:
+        _auth_states.set(user_id, state)
+    return state
+
+
+def invalidate_auth_state(user_id):
+    _auth_states.invalidate(user_id)
+
+
+def is_token_revoked(jwt_payload):
+    """Reject tokens of deleted/deactivated users or with a stale token version."""
+    identity = jwt_payload.get("sub")
+    try:
+        user_id = identity if isinstance(identity, UUID) else UUID(identity)
+    except (TypeError, ValueError):
+        return True
+
+    state = get_auth_state(user_id)
+    if state is None or not state.is_active:
+        return True
+    return jwt_payload.get("tv", 0) != state.token_version
@@ -0,0 +1,130 @@
+import csv
+import io
+import uuid
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.ledger import LeaveLedger
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.services.reference_data import reference_data
+from app.utils.passwords import hash_passwords
+
+LOCATIONS = ("Pune", "Ahmedabad")
+MAX_IMPORT_ROWS = 1000
+
+
+class EmployeeImportError(ValueError):
+    """Raised when the upload as a whole cannot be imported."""
+
+
+def parse_csv(text):
+    """Rows from a CSV with a header line (email, full_name, password[, location])."""
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or not {"email", "full_name", "password"} <= {f.strip() for f in reader.fieldnames}:
+        raise EmployeeImportError("CSV header must include email, full_name and password")
+    return [{(k or "").strip(): v for k, v in row.items()} for row in reader]
+
+
+class EmployeeImportService:
+
+    @staticmethod
+    def import_employees(rows):
+        """
+        Create EMPLOYEE users (with role and current-year ledgers) for each row.
+
+        Valid rows are inserted in one transaction with executemany inserts;
+        invalid rows and existing emails are reported and skipped. Returns
+        one result dict per input row, in input order.
+        """
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise EmployeeImportError(f"At most {MAX_IMPORT_ROWS} rows can be imported at once")
+
+        employee_role = reference_data.role_by_name("EMPLOYEE")
+        if not employee_role:
+            raise EmployeeImportError("Employee role not found")
+
+        leave_types = reference_data.leave_types()
+        if not leave_types:
+            raise EmployeeImportError("No leave types found. Please contact administrator.")
+
+        results = []
+        pending = []
+        seen = set()
+
+        for index, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                results.append({"row": index, "status": "error", "message": "Row must be an object"})
+                continue
+
+            email = (row.get("email") or "").strip()
+            full_name = (row.get("full_name") or "").strip()
+            password = row.get("password") or ""
+            location = (row.get("location") or "").strip() or "Pune"
+
+            result = {"row": index, "email": email}
+            results.append(result)
+
+            if not email or not full_name or not password:
+                result.update(status="error", message="Email, full name, and password are required")
+            elif location not in LOCATIONS:
+                result.update(status="error", message=f"Location must be one of {', '.join(LOCATIONS)}")
+            elif email.lower() in seen:
+                result.update(status="error", message="Duplicate email in upload")
+            else:
+                seen.add(email.lower())
+                pending.append((result, email, full_name, password, location))
+
+        # One round trip for every email already in the table
+        if pending:
+            existing = set(db.session.scalars(
+                select(User.email).where(User.email.in_([p[1] for p in pending]))
+            ))
+            for result, email, *_ in pending:
+                if email in existing:
+                    result.update(status="error", message="Email already exists")
+            pending = [p for p in pending if p[1] not in existing]
+
+        if not pending:
+            return results
+
+        hashes = hash_passwords([p[3] for p in pending])
+
+        users, user_roles, ledgers = [], [], []
+        current_year = datetime.utcnow().year
+
+        for (result, email, full_name, _, location), password_hash in zip(pending, hashes):
+            user_id = uuid.uuid4()
+            users.append({
+                "id": user_id,
+                "email": email,
+                "full_name": full_name,
+                "location": location,
+                "password_hash": password_hash
+            })
+            user_roles.append({"id": uuid.uuid4(), "user_id": user_id, "role_id": employee_role.id})
+            ledgers.extend(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "leave_type_id": leave_type.id,
+                    "year": current_year,
+                    "total_quota": leave_type.default_quota,
+                    "used_days": 0
+                }
+                for leave_type in leave_types
+            )
+            result.update(status="created", user_id=str(user_id))
+
+        try:
+            db.session.execute(insert(User), users)
+            db.session.execute(insert(UserRole), user_roles)
+            db.session.execute(insert(LeaveLedger), ledgers)
+            db.session.commit()
+        except IntegrityError:
+            # An email was taken between the check and the insert
+            db.session.rollback()
+            raise EmployeeImportError("Some emails were created concurrently. Please retry the import.")
+
+        return results
@@ -0,0 +1,77 @@
+import hashlib
+from app.extensions import db
+from app.models.holiday import Holiday
+from app.services.working_calendar import invalidate_calendar
+from app.utils.cache import TTLCache
+
+
+class HolidayList:
+    """Serialized holidays for one location, newest first, plus a content ETag."""
+
+    def __init__(self, items):
+        self.items = items
+        # Derived from the data, so every worker gives the same ETag for the same holidays
+        self.digest = hashlib.sha1(repr(items).encode()).hexdigest()[:16]
+
+    def filtered(self, date_from=None, date_to=None):
+        if not date_from and not date_to:
+            return self.items
+        # ISO dates compare correctly as strings
+        return [
+            h for h in self.items
+            if (not date_from or h["date"] >= date_from)
+            and (not date_to or h["date"] <= date_to)
+        ]
+
+    def etag(self, date_from=None, date_to=None):
+        return f"{self.digest}-{date_from or ''}-{date_to or ''}"
+
+
+class HolidayCache:
+    """
+    In-process cache of the serialized holiday list per location.
+
+    ``bump()`` drops this process's lists on every holiday write here; the
+    TTL bounds staleness for writes made through other workers. Keys come
+    from the ``location`` query argument, so the cache is size-bounded.
+    """
+
+    def __init__(self, ttl=60, maxsize=32):
+        self._lists = TTLCache(ttl, maxsize=maxsize)
+
+    def init_app(self, app):
+        self._lists.ttl = app.config.get("HOLIDAY_CACHE_TTL", 60)
+
+    def get(self, location=None):
+        key = location if location and location != "All" else None
+        return self._lists.get_or_load(key, lambda: self._load(key))
+
+    def _load(self, location):
+        query = Holiday.query
+        if location:
+            query = query.filter((Holiday.location == location) | (Holiday.location == "All"))
+
+        holidays = query.order_by(Holiday.date.desc()).all()
+        return HolidayList(
+            [
+                {
+                    "id": str(h.id),
+                    "name": h.name,
+                    "date": h.date.isoformat(),
+                    "location": h.location
+                }
+                for h in holidays
+            ]
+        )
+
+    def bump(self):
+        self._lists.invalidate()
+
+
+holiday_cache = HolidayCache()
+
+
+def holidays_changed():
+    """Call after committing any holiday create/update/delete."""
+    holiday_cache.bump()
+    invalidate_calendar()
@@ -1,5 +1,5 @@
 # app/services/leave_calculator.py
-from datetime import timedelta
+from collections import defaultdict
 
 WEEKEND_DAYS = {5, 6}  # Saturday=5, Sunday=6
 
@@ -7,18 +7,66 @@ def is_weekend(date):
     """Check if date is Saturday or Sunday"""
     return date.weekday() in WEEKEND_DAYS
 
-def calculate_leave_days(start_date, end_date):
+def calculate_leave_days(start_date, end_date, location=None, sandwich=True):
     """
-    Applies sandwich rule.
+    Number of leave days charged for [start_date, end_date].
+
+    Weekends and holidays (for ``location`` plus "All") at either edge of the
+    range are never charged. With the sandwich rule, non-working days that
+    fall between two leave days are charged; without it only working days
+    are counted.
+    """
+    from app.services.working_calendar import working_calendar
+
+    if not sandwich:
+        return working_calendar.count_working_days(start_date, end_date, location)
+
+    first = working_calendar.first_working_day(start_date, end_date, location)
+    if first is None:
+        return 0
+    last = working_calendar.last_working_day(start_date, end_date, location)
+
+    return (last - first).days + 1
+
+def calculate_leave_days_bulk(start_dates, end_dates, locations, sandwich=True):
+    """
+    Batch form of calculate_leave_days for imports/recalculation jobs.
+
+    Takes parallel sequences of start dates, end dates and locations and
+    returns a list of day counts. Ranges within one year are grouped by
+    (year, location): each group fetches its YearCalendar once and is then
+    answered straight from its prefix / next_working / prev_working arrays.
+    The few ranges that cross a year boundary go through calculate_leave_days.
     """
-    total_days = 0
-    current = start_date
+    from app.services.working_calendar import working_calendar
+
+    if not (len(start_dates) == len(end_dates) == len(locations)):
+        raise ValueError("start_dates, end_dates and locations must have the same length")
+
+    results = [0] * len(start_dates)
+    groups = defaultdict(list)
+    for i, (start, end, location) in enumerate(zip(start_dates, end_dates, locations)):
+        if start > end:
+            continue
+        if start.year == end.year:
+            groups[(start.year, location)].append(i)
+        else:
+            results[i] = calculate_leave_days(start, end, location, sandwich)
 
-    while current <= end_date:
-        total_days += 1
-        current += timedelta(days=1)
+    for (year, location), rows in groups.items():
+        calendar = working_calendar.get(year, location)
+        first_day, prefix = calendar.first_day, calendar.prefix
+        next_working, prev_working = calendar.next_working, calendar.prev_working
+        for i in rows:
+            start_idx = (start_dates[i] - first_day).days
+            end_idx = (end_dates[i] - first_day).days
+            if not sandwich:
+                results[i] = prefix[end_idx + 1] - prefix[start_idx]
+                continue
+            first = next_working[start_idx]
+            results[i] = prev_working[end_idx] - first + 1 if first <= end_idx else 0
 
-    return total_days
+    return results
 
 def validate_leave_dates(start_date, end_date):
     """Validate that leave dates don't fall on weekends"""
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from sqlalchemy import select
+from app.extensions import db
+from app.models.leave import LeaveType
+from app.models.leave_request import LeaveRequest
+from app.models.user import User
+
+EXPORT_COLUMNS = [
+    "leave_id",
+    "employee_name",
+    "employee_email",
+    "employee_location",
+    "leave_type",
+    "start_date",
+    "end_date",
+    "total_days",
+    "status",
+    "reason",
+    "rejection_reason",
+    "applied_at",
+    "processed_at",
+]
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_statement(date_from=None, date_to=None, status=None):
+    stmt = select(
+        LeaveRequest.id.label("leave_id"),
+        User.full_name.label("employee_name"),
+        User.email.label("employee_email"),
+        User.location.label("employee_location"),
+        LeaveType.name.label("leave_type"),
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.total_days,
+        LeaveRequest.status,
+        LeaveRequest.reason,
+        LeaveRequest.rejection_reason,
+        LeaveRequest.applied_at,
+        LeaveRequest.processed_at
+    ).join(
+        User, User.id == LeaveRequest.user_id
+    ).join(
+        LeaveType, LeaveType.id == LeaveRequest.leave_type_id
+    )
+
+    if date_from:
+        stmt = stmt.where(LeaveRequest.start_date >= date_from)
+    if date_to:
+        stmt = stmt.where(LeaveRequest.start_date <= date_to)
+    if status:
+        stmt = stmt.where(LeaveRequest.status == status)
+
+    # yield_per turns on stream_results: rows come from a server-side cursor
+    # in batches, so memory stays flat however large the export is.
+    return stmt.order_by(
+        LeaveRequest.start_date, LeaveRequest.id
+    ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _plain(value):
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def stream_csv(stmt):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+
+    for partition in db.session.execute(stmt).partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            ["" if v is None else _plain(v) for v in row]
+            for row in partition
+        )
+        yield buffer.getvalue()
+
+
+def stream_ndjson(stmt):
+    for partition in db.session.execute(stmt).partitions():
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row)))) + "\n"
+            for row in partition
+        )
@@ -1,57 +1,240 @@
-from datetime import date
+import uuid
+from sqlalchemy import bindparam, func, literal, select, true, tuple_
+from app.models.leave import LeaveType
 from app.models.ledger import LeaveLedger
+from app.models.user import User
 from app.extensions import db
+from app.services.reference_data import reference_data
+from app.utils.sql import dialect_insert, greatest, new_uuid
+
+class LedgerNotFound(ValueError):
+    """No ledger row exists for the (user, leave type, year) being changed."""
+
 
 class LeaveLedgerService:
+    """
+    Balance changes are single conditional ``UPDATE ... RETURNING``
+    statements: the guard (enough balance, quota not below used days) is in
+    the WHERE clause, so no row lock is held between a read and a write.
+    The ck_leave_ledger_* CHECK constraints back the same invariants up.
+    """
 
     @staticmethod
-    def deduct_leave(user_id, leave_type_id, days, leave_start_date):
-        # Use the year from the leave start date, not current year
-        leave_year = leave_start_date.year
+    def _ledger_filter(table, user_id, leave_type_id, year):
+        return (
+            (table.c.user_id == user_id)
+            & (table.c.leave_type_id == leave_type_id)
+            & (table.c.year == year)
+        )
+
+    @staticmethod
+    def _update_returning(user_id, leave_type_id, year, values, guard=None):
+        table = LeaveLedger.__table__
+        condition = LeaveLedgerService._ledger_filter(table, user_id, leave_type_id, year)
+        if guard is not None:
+            condition = condition & guard
 
-        ledger = LeaveLedger.query.filter_by(
-            user_id=user_id,
-            leave_type_id=leave_type_id,
-            year=leave_year
-        ).with_for_update().first()
+        return db.session.execute(
+            table.update().where(condition).values(**values).returning(
+                table.c.id, table.c.total_quota, table.c.used_days
+            )
+        ).first()
 
-        if not ledger:
-            # Auto-create ledger for the year if it doesn't exist
-            from app.models.leave_type import LeaveType
-            leave_type = LeaveType.query.get(leave_type_id)
-            if not leave_type:
-                raise ValueError("Invalid leave type")
-            
-            ledger = LeaveLedger(
+    @staticmethod
+    def _current(user_id, leave_type_id, year):
+        """(total_quota, used_days) for an error message, or None if the ledger is missing."""
+        table = LeaveLedger.__table__
+        return db.session.execute(
+            select(table.c.total_quota, table.c.used_days).where(
+                LeaveLedgerService._ledger_filter(table, user_id, leave_type_id, year)
+            )
+        ).first()
+
+    @staticmethod
+    def _create_ledger(user_id, leave_type_id, year):
+        leave_type = reference_data.leave_type(leave_type_id)
+        if not leave_type:
+            raise ValueError("Invalid leave type")
+
+        # A concurrent request may create the same ledger; either row is fine
+        db.session.execute(
+            dialect_insert(LeaveLedger).values(
+                id=uuid.uuid4(),
                 user_id=user_id,
                 leave_type_id=leave_type_id,
-                year=leave_year,
-                total_quota=20,  # Default quota
+                year=year,
+                total_quota=leave_type.default_quota,
                 used_days=0
+            ).on_conflict_do_nothing(index_elements=["user_id", "leave_type_id", "year"])
+        )
+
+    @staticmethod
+    def deduct_leave(user_id, leave_type_id, days, leave_start_date):
+        # Use the year from the leave start date, not current year
+        leave_year = leave_start_date.year
+        table = LeaveLedger.__table__
+        used = func.coalesce(table.c.used_days, 0)
+
+        def deduct():
+            return LeaveLedgerService._update_returning(
+                user_id, leave_type_id, leave_year,
+                {"used_days": used + days},
+                guard=table.c.total_quota - used >= days
             )
-            db.session.add(ledger)
-            db.session.flush()
 
-        if ledger.remaining_days < days:
-            raise ValueError(f"Insufficient leave balance for year {leave_year}")
+        row = deduct()
+        if row is None and LeaveLedgerService._current(user_id, leave_type_id, leave_year) is None:
+            # Auto-create ledger for the year if it doesn't exist
+            LeaveLedgerService._create_ledger(user_id, leave_type_id, leave_year)
+            row = deduct()
 
-        ledger.used_days += days
-        return ledger
+        if row is None:
+            raise ValueError(f"Insufficient leave balance for year {leave_year}")
+        return row
 
     @staticmethod
     def restore_leave(user_id, leave_type_id, days, leave_start_date):
         """Restore leave balance when leave is cancelled"""
         leave_year = leave_start_date.year
+        used = func.coalesce(LeaveLedger.__table__.c.used_days, 0)
+
+        row = LeaveLedgerService._update_returning(
+            user_id, leave_type_id, leave_year,
+            {"used_days": greatest(used - days, 0)}
+        )
+        if row is None:
+            raise LedgerNotFound(f"Leave ledger not found for year {leave_year}")
+        return row
+
+    @staticmethod
+    def update_quota(user_id, leave_type_id, year, new_quota):
+        """Set total_quota unless it would drop below the days already used."""
+        if new_quota < 0:
+            raise ValueError("Quota cannot be negative")
+
+        used = func.coalesce(LeaveLedger.__table__.c.used_days, 0)
+        row = LeaveLedgerService._update_returning(
+            user_id, leave_type_id, year,
+            {"total_quota": new_quota},
+            guard=used <= new_quota
+        )
+        if row is None:
+            if LeaveLedgerService._current(user_id, leave_type_id, year) is None:
+                raise LedgerNotFound("Leave ledger not found")
+            raise ValueError("New quota cannot be less than already used days")
+        return row
+
+    @staticmethod
+    def adjust_quota(user_id, leave_type_id, year, adjustment):
+        """Add ``adjustment`` (may be negative) to total_quota, keeping it >= used days and >= 0."""
+        table = LeaveLedger.__table__
+        new_quota = table.c.total_quota + adjustment
+        used = func.coalesce(table.c.used_days, 0)
+
+        row = LeaveLedgerService._update_returning(
+            user_id, leave_type_id, year,
+            {"total_quota": new_quota},
+            guard=(new_quota >= used) & (new_quota >= 0)
+        )
+        if row is None:
+            current = LeaveLedgerService._current(user_id, leave_type_id, year)
+            if current is None:
+                raise LedgerNotFound("Leave ledger not found")
+            total_quota, used_days = current
+            new_total = total_quota + adjustment
+            if new_total < (used_days or 0):
+                raise ValueError(
+                    f"Cannot adjust quota. New quota ({new_total}) would be less than already used days ({used_days})"
+                )
+            raise ValueError("Quota cannot be negative")
+        return row
+
+    @staticmethod
+    def lock_ledgers(keys):
+        """
+        Lock the ledgers for ``keys`` ((user_id, leave_type_id, year) tuples)
+        in one SELECT ... FOR UPDATE, always in key order so concurrent bulk
+        operations acquire row locks in the same sequence. Missing ledgers
+        are created with their leave type's default quota. Returns {key: ledger}.
+        """
+        keys = sorted(set(keys), key=lambda k: (str(k[0]), str(k[1]), k[2]))
+        if not keys:
+            return {}
 
-        ledger = LeaveLedger.query.filter_by(
-            user_id=user_id,
-            leave_type_id=leave_type_id,
-            year=leave_year
-        ).with_for_update().first()
+        def select_for_update():
+            ledgers = LeaveLedger.query.filter(
+                tuple_(LeaveLedger.user_id, LeaveLedger.leave_type_id, LeaveLedger.year).in_(keys)
+            ).order_by(
+                LeaveLedger.user_id, LeaveLedger.leave_type_id, LeaveLedger.year
+            ).with_for_update().all()
+            return {(l.user_id, l.leave_type_id, l.year): l for l in ledgers}
+
+        by_key = select_for_update()
+        missing = [k for k in keys if k not in by_key]
+        if not missing:
+            return by_key
+
+        rows = []
+        for user_id, leave_type_id, year in missing:
+            leave_type = reference_data.leave_type(leave_type_id)
+            if not leave_type:
+                raise ValueError("Invalid leave type")
+            rows.append({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "leave_type_id": leave_type_id,
+                "year": year,
+                "total_quota": leave_type.default_quota,
+                "used_days": 0
+            })
+
+        # A concurrent request may create some of these first; keep its rows
+        db.session.execute(
+            dialect_insert(LeaveLedger).values(rows).on_conflict_do_nothing(
+                index_elements=["user_id", "leave_type_id", "year"]
+            )
+        )
+        return select_for_update()
+
+    @staticmethod
+    def apply_deductions(deductions):
+        """Add days to used_days for many ledgers in one executemany. ``deductions``: {ledger_id: days}."""
+        if not deductions:
+            return
+
+        table = LeaveLedger.__table__
+        db.session.execute(
+            table.update().where(
+                table.c.id == bindparam("ledger_id")
+            ).values(
+                used_days=func.coalesce(table.c.used_days, 0) + bindparam("days")
+            ),
+            [{"ledger_id": ledger_id, "days": days} for ledger_id, days in deductions.items()]
+        )
+
+    @staticmethod
+    def generate_year(year):
+        """
+        Create ``year`` ledgers for every active user and active leave type
+        that does not have one yet, with the type's default quota, in one
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING. Safe to re-run; the
+        caller commits. Returns the number of ledgers created.
+        """
+        source = select(
+            new_uuid(),
+            User.id,
+            LeaveType.id,
+            literal(year),
+            LeaveType.default_quota,
+            literal(0)
+        ).select_from(User).join(LeaveType, true()).where(
+            User.is_active.is_(True),
+            LeaveType.is_active.is_(True)
+        )
 
-        if not ledger:
-            raise ValueError(f"Leave ledger not found for year {leave_year}")
+        stmt = dialect_insert(LeaveLedger).from_select(
+            ["id", "user_id", "leave_type_id", "year", "total_quota", "used_days"],
+            source
+        ).on_conflict_do_nothing(index_elements=["user_id", "leave_type_id", "year"])
 
-        # Restore the days
-        ledger.used_days = max(0, ledger.used_days - days)
-        return ledger
\ No newline at end of file
+        return db.session.execute(stmt).rowcount
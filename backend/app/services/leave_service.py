@@ -1,10 +1,14 @@
+from flask import current_app
 from app.extensions import db
 from app.models.leave_request import LeaveRequest
+from app.models.user import User
 from app.services.leave_calculator import calculate_leave_days
 from app.services.leave_ledger_service import LeaveLedgerService
+from app.services.leave_stats_service import LeaveStatsService
+from app.utils.sql import is_postgres
 from uuid import UUID
-from sqlalchemy import or_
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from typing import List
 from datetime import date, timedelta
 
@@ -18,7 +22,53 @@ class LeaveService:
         if start_date > end_date:
             raise ValueError("Invalid date range")
 
-        # Check for overlapping leaves (PENDING or APPROVED)
+        # The INSERT itself rejects exact duplicates (uq_leave_requests_user_type_dates)
+        # and, on Postgres, overlaps (ex_leave_requests_no_overlap). Without the
+        # exclusion constraint, overlaps are pre-checked.
+        if not is_postgres():
+            conflict = LeaveService._conflict_message(user_id, start_date, end_date, data["leave_type_id"])
+            if conflict:
+                raise ValueError(conflict)
+
+        location = db.session.query(User.location).filter_by(id=user_id).scalar()
+        total_days = calculate_leave_days(
+            start_date,
+            end_date,
+            location=location,
+            sandwich=current_app.config.get("LEAVE_SANDWICH_RULE", True)
+        )
+
+        if total_days == 0:
+            raise ValueError("Selected dates contain no working days")
+
+        leave = LeaveRequest(
+            user_id=user_id,
+            leave_type_id=data["leave_type_id"],
+            start_date=start_date,
+            end_date=end_date,
+            total_days=total_days,
+            reason=data.get("reason")
+        )
+
+        db.session.add(leave)
+        try:
+            db.session.flush()
+        except IntegrityError:
+            db.session.rollback()
+            conflict = LeaveService._conflict_message(user_id, start_date, end_date, data["leave_type_id"])
+            if conflict:
+                raise ValueError(conflict)
+            raise
+
+        LeaveStatsService.record_transition(leave, None, "PENDING", location=location)
+        db.session.commit()
+
+        return leave, total_days
+
+    @staticmethod
+    def _conflict_message(user_id, start_date, end_date, leave_type_id):
+        """The 400 message for a request clashing with an existing one, or None."""
+        # Overlapping leaves (PENDING or APPROVED)
         existing_leave = LeaveRequest.query.filter(
             LeaveRequest.user_id == user_id,
             LeaveRequest.status.in_(["PENDING", "APPROVED"]),
@@ -29,34 +79,19 @@ class LeaveService:
         ).first()
 
         if existing_leave:
-            raise ValueError(f"You already have a {existing_leave.status.lower()} leave request for overlapping dates")
+            return f"You already have a {existing_leave.status.lower()} leave request for overlapping dates"
 
-        # Check for exact duplicate (including REJECTED)
+        # Exact duplicate (including REJECTED)
         duplicate = LeaveRequest.query.filter(
             LeaveRequest.user_id == user_id,
             LeaveRequest.start_date == start_date,
             LeaveRequest.end_date == end_date,
-            LeaveRequest.leave_type_id == data["leave_type_id"]
+            LeaveRequest.leave_type_id == leave_type_id
         ).first()
 
         if duplicate:
-            raise ValueError(f"You already applied for this exact leave period. Status: {duplicate.status}")
-
-        total_days = calculate_leave_days(start_date, end_date)
-
-        leave = LeaveRequest(
-            user_id=user_id,
-            leave_type_id=data["leave_type_id"],
-            start_date=start_date,
-            end_date=end_date,
-            total_days=total_days,
-            reason=data.get("reason")
-        )
-
-        db.session.add(leave)
-        db.session.commit()
-
-        return leave, total_days
+            return f"You already applied for this exact leave period. Status: {duplicate.status}"
+        return None
 
     @staticmethod
     def approve_leave(leave_id: UUID):
@@ -75,6 +110,7 @@ class LeaveService:
 
             leave.status = "APPROVED"
             leave.processed_at = db.func.now()
+            LeaveStatsService.record_transition(leave, "PENDING", "APPROVED")
 
             db.session.commit()
             return leave
@@ -93,6 +129,7 @@ class LeaveService:
         leave.status = "REJECTED"
         leave.rejection_reason = rejection_reason
         leave.processed_at = db.func.now()
+        LeaveStatsService.record_transition(leave, "PENDING", "REJECTED")
         db.session.commit()
         return leave
 
@@ -124,6 +161,7 @@ class LeaveService:
 
             leave.status = "CANCELLED"
             leave.processed_at = db.func.now()
+            LeaveStatsService.record_transition(leave, "APPROVED", "CANCELLED")
 
             db.session.commit()
             return leave
@@ -132,6 +170,114 @@ class LeaveService:
             db.session.rollback()
             raise ValueError(str(e))
 
+    @staticmethod
+    def _lock_pending_batch(leave_ids):
+        """Lock the requested leaves in (user_id, leave_type_id, id) order; returns {id: leave}."""
+        leaves = LeaveRequest.query.filter(
+            LeaveRequest.id.in_(leave_ids)
+        ).order_by(
+            LeaveRequest.user_id, LeaveRequest.leave_type_id, LeaveRequest.id
+        ).with_for_update().all()
+        return {l.id: l for l in leaves}
+
+    @staticmethod
+    def _batch_error(leave_id, leaves):
+        leave = leaves.get(leave_id)
+        if leave is None:
+            return "Leave request not found"
+        if leave.status != "PENDING":
+            return f"Only pending leaves can be processed (status: {leave.status})"
+        return None
+
+    @staticmethod
+    def bulk_approve(leave_ids: List[UUID]):
+        """
+        Approve many leave requests in one transaction with partial-failure
+        semantics: requests that are missing, not pending or would overdraw
+        a ledger are reported and skipped, the rest are approved together.
+
+        Requests and then ledgers are each locked with a single ordered
+        SELECT ... FOR UPDATE, so concurrent bulk calls cannot deadlock.
+        """
+        try:
+            leaves = LeaveService._lock_pending_batch(leave_ids)
+            errors = {lid: LeaveService._batch_error(lid, leaves) for lid in leave_ids}
+
+            candidates = sorted(
+                (leaves[lid] for lid in set(leave_ids) if not errors[lid]),
+                key=lambda l: (str(l.user_id), str(l.leave_type_id), l.start_date, str(l.id))
+            )
+            ledgers = LeaveLedgerService.lock_ledgers(
+                (l.user_id, l.leave_type_id, l.start_date.year) for l in candidates
+            )
+
+            deductions = {}
+            approved = []
+            for leave in candidates:
+                ledger = ledgers[(leave.user_id, leave.leave_type_id, leave.start_date.year)]
+                pending_days = deductions.get(ledger.id, 0)
+                if ledger.remaining_days - pending_days < leave.total_days:
+                    errors[leave.id] = f"Insufficient leave balance for year {leave.start_date.year}"
+                    continue
+                deductions[ledger.id] = pending_days + leave.total_days
+                approved.append(leave)
+
+            if approved:
+                LeaveLedgerService.apply_deductions(deductions)
+                db.session.execute(
+                    update(LeaveRequest.__table__).where(
+                        LeaveRequest.__table__.c.id.in_([l.id for l in approved])
+                    ).values(status="APPROVED", processed_at=db.func.now())
+                )
+                LeaveStatsService.record_transitions(
+                    [(l, "PENDING", "APPROVED", None) for l in approved]
+                )
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return LeaveService._batch_results(leave_ids, errors, "APPROVED")
+
+    @staticmethod
+    def bulk_reject(leave_ids: List[UUID], rejection_reason: str = None):
+        """Reject many pending leave requests in one transaction (partial-failure semantics)."""
+        try:
+            leaves = LeaveService._lock_pending_batch(leave_ids)
+            errors = {lid: LeaveService._batch_error(lid, leaves) for lid in leave_ids}
+            rejected = [leaves[lid] for lid in set(leave_ids) if not errors[lid]]
+
+            if rejected:
+                db.session.execute(
+                    update(LeaveRequest.__table__).where(
+                        LeaveRequest.__table__.c.id.in_([l.id for l in rejected])
+                    ).values(
+                        status="REJECTED",
+                        rejection_reason=rejection_reason,
+                        processed_at=db.func.now()
+                    )
+                )
+                LeaveStatsService.record_transitions(
+                    [(l, "PENDING", "REJECTED", None) for l in rejected]
+                )
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return LeaveService._batch_results(leave_ids, errors, "REJECTED")
+
+    @staticmethod
+    def _batch_results(leave_ids, errors, new_status):
+        return [
+            {"leave_id": str(lid), "status": new_status}
+            if not errors[lid]
+            else {"leave_id": str(lid), "error": errors[lid]}
+            for lid in leave_ids
+        ]
+
     @staticmethod
     def get_user_leaves(user_id: UUID) -> List[LeaveRequest]:
         return LeaveRequest.query.filter_by(user_id=user_id).all()
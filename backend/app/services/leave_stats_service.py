@@ -0,0 +1,138 @@
+from sqlalchemy import Integer, cast, delete, extract, func, select
+from app.extensions import db
+from app.models.leave_request import LeaveRequest
+from app.models.leave_stats import LeaveStatsMonthly
+from app.models.user import User
+from app.utils.sql import dialect_insert
+
+UNKNOWN_LOCATION = "Unknown"
+
+
+class LeaveStatsService:
+
+    @staticmethod
+    def record_transition(leave, old_status, new_status, location=None):
+        """
+        Move ``leave`` from its ``old_status`` bucket to ``new_status`` in the
+        monthly rollup. Pass ``old_status=None`` for a new request. Runs in
+        the caller's transaction; the caller commits.
+        """
+        LeaveStatsService.record_transitions(
+            [(leave, old_status, new_status, location)]
+        )
+
+    @staticmethod
+    def record_transitions(transitions):
+        """Batch form of record_transition: one upsert for many (leave, old, new, location) items."""
+        deltas = {}
+        missing = {t[0].user_id for t in transitions if t[3] is None}
+        locations = dict(
+            db.session.query(User.id, User.location).filter(User.id.in_(missing)).all()
+        ) if missing else {}
+
+        for leave, old_status, new_status, location in transitions:
+            location = location or locations.get(leave.user_id) or UNKNOWN_LOCATION
+            base = (leave.start_date.year, leave.start_date.month, leave.leave_type_id, location)
+            for status, sign in ((old_status, -1), (new_status, 1)):
+                if status is None:
+                    continue
+                count, days = deltas.get(base + (status,), (0, 0))
+                deltas[base + (status,)] = (count + sign, days + sign * leave.total_days)
+
+        LeaveStatsService._apply_deltas(deltas)
+
+    @staticmethod
+    def move_user(user_id, old_location, new_location):
+        """
+        Re-key a user's requests from ``old_location`` to ``new_location``
+        after their location changes, so the rollup keeps matching
+        rebuild(), which groups by the user's current location. Call in the
+        same transaction as the location update; the caller commits.
+        """
+        old_location = old_location or UNKNOWN_LOCATION
+        new_location = new_location or UNKNOWN_LOCATION
+        if old_location == new_location:
+            return
+
+        year = cast(extract("year", LeaveRequest.start_date), Integer)
+        month = cast(extract("month", LeaveRequest.start_date), Integer)
+        buckets = db.session.query(
+            year,
+            month,
+            LeaveRequest.leave_type_id,
+            LeaveRequest.status,
+            func.count(LeaveRequest.id),
+            func.coalesce(func.sum(LeaveRequest.total_days), 0)
+        ).filter(
+            LeaveRequest.user_id == user_id
+        ).group_by(
+            year, month, LeaveRequest.leave_type_id, LeaveRequest.status
+        ).all()
+
+        deltas = {}
+        for y, m, leave_type_id, status, count, days in buckets:
+            deltas[(y, m, leave_type_id, old_location, status)] = (-count, -days)
+            deltas[(y, m, leave_type_id, new_location, status)] = (count, days)
+        LeaveStatsService._apply_deltas(deltas)
+
+    @staticmethod
+    def _apply_deltas(deltas):
+        """Upsert {(year, month, leave_type_id, location, status): (count, days)} increments."""
+        rows = [
+            {
+                "year": year,
+                "month": month,
+                "leave_type_id": leave_type_id,
+                "location": location,
+                "status": status,
+                "leave_count": count,
+                "total_days": days
+            }
+            # Primary-key order, so concurrent batches lock the buckets in the same sequence
+            for (year, month, leave_type_id, location, status), (count, days) in sorted(
+                deltas.items(), key=lambda item: (item[0][0], item[0][1], str(item[0][2]), item[0][3], item[0][4])
+            )
+            if count or days
+        ]
+        if not rows:
+            return
+
+        stmt = dialect_insert(LeaveStatsMonthly).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["year", "month", "leave_type_id", "location", "status"],
+            set_={
+                "leave_count": LeaveStatsMonthly.leave_count + stmt.excluded.leave_count,
+                "total_days": LeaveStatsMonthly.total_days + stmt.excluded.total_days
+            }
+        )
+        db.session.execute(stmt)
+
+    @staticmethod
+    def rebuild():
+        """Recompute the whole rollup from leave_requests (backfill / repair). Caller commits."""
+        year = cast(extract("year", LeaveRequest.start_date), Integer)
+        month = cast(extract("month", LeaveRequest.start_date), Integer)
+        location = func.coalesce(User.location, UNKNOWN_LOCATION)
+
+        source = select(
+            year,
+            month,
+            LeaveRequest.leave_type_id,
+            location,
+            LeaveRequest.status,
+            func.count(LeaveRequest.id),
+            func.coalesce(func.sum(LeaveRequest.total_days), 0)
+        ).join(
+            User, User.id == LeaveRequest.user_id
+        ).group_by(
+            year, month, LeaveRequest.leave_type_id, location, LeaveRequest.status
+        )
+
+        db.session.execute(delete(LeaveStatsMonthly))
+        result = db.session.execute(
+            LeaveStatsMonthly.__table__.insert().from_select(
+                ["year", "month", "leave_type_id", "location", "status", "leave_count", "total_days"],
+                source
+            )
+        )
+        return result.rowcount
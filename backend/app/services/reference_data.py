@@ -0,0 +1,137 @@
+import hashlib
+from collections import namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.leave import LeaveType
+from app.models.role import Role
+from app.utils.cache import TTLCache
+
+LeaveTypeRef = namedtuple("LeaveTypeRef", ["id", "name", "is_active", "default_quota"])
+RoleRef = namedtuple("RoleRef", ["id", "name"])
+
+SHARED_VERSION_KEY = "nexus:reference-data:version"
+
+
+class ReferenceSnapshot:
+    """Immutable copy of a small reference table, indexed by id and by name."""
+
+    def __init__(self, rows, version):
+        self.rows = rows
+        self.by_id = {r.id: r for r in rows}
+        self.by_name = {r.name: r for r in rows}
+        self.version = version
+        digest = hashlib.sha1(repr(rows).encode()).hexdigest()[:16]
+        self.etag = f"{digest}-{version}"
+
+
+class RedisVersion:
+    """Shared invalidation counter so every worker drops its copy on a write."""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("REFERENCE_CACHE_REDIS_URL is set but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+
+    def current(self):
+        return int(self.client.get(SHARED_VERSION_KEY) or 0)
+
+    def bump(self):
+        self.client.incr(SHARED_VERSION_KEY)
+
+
+class ReferenceData:
+    """
+    Process-local TTL cache for LeaveType and Role rows.
+
+    These tables hold a handful of rows and change only through seeds or
+    admin tooling, so lookups are served from memory. Any ORM commit that
+    touches a LeaveType or Role invalidates the cache (and bumps the shared
+    version when a Redis URL is configured, so other workers reload too).
+    """
+
+    def __init__(self, ttl=300):
+        self._cache = TTLCache(ttl)
+        self._shared = None
+
+    def init_app(self, app):
+        self._cache.ttl = app.config.get("REFERENCE_CACHE_TTL", 300)
+        url = app.config.get("REFERENCE_CACHE_REDIS_URL")
+        self._shared = RedisVersion(url) if url else None
+
+    def _version(self):
+        return self._shared.current() if self._shared else 0
+
+    def _snapshot(self, kind, loader):
+        version = self._version()
+        snapshot = self._cache.get(kind)
+        if snapshot is None or snapshot.version != version:
+            snapshot = ReferenceSnapshot(loader(), version)
+            self._cache.set(kind, snapshot)
+        return snapshot
+
+    # ---------- leave types ----------
+    def leave_types_snapshot(self):
+        return self._snapshot("leave_types", lambda: tuple(
+            LeaveTypeRef(lt.id, lt.name, lt.is_active, lt.default_quota)
+            for lt in db.session.query(LeaveType).order_by(LeaveType.name)
+        ))
+
+    def leave_types(self):
+        return self.leave_types_snapshot().rows
+
+    def leave_type(self, leave_type_id):
+        return self.leave_types_snapshot().by_id.get(leave_type_id)
+
+    def leave_type_by_name(self, name):
+        return self.leave_types_snapshot().by_name.get(name)
+
+    # ---------- roles ----------
+    def roles_snapshot(self):
+        return self._snapshot("roles", lambda: tuple(
+            RoleRef(r.id, r.name)
+            for r in db.session.query(Role).order_by(Role.name)
+        ))
+
+    def roles(self):
+        return self.roles_snapshot().rows
+
+    def role(self, role_id):
+        return self.roles_snapshot().by_id.get(role_id)
+
+    def role_by_name(self, name):
+        return self.roles_snapshot().by_name.get(name)
+
+    def invalidate(self):
+        self._cache.invalidate()
+        if self._shared:
+            self._shared.bump()
+
+
+reference_data = ReferenceData()
+
+
+# ---------- invalidate on writes ----------
+_REFERENCE_MODELS = (LeaveType, Role)
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_reference_writes(session, flush_context, instances):
+    if any(
+        isinstance(obj, _REFERENCE_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["reference_data_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("reference_data_dirty", False):
+        reference_data.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session):
+    session.info.pop("reference_data_dirty", None)
@@ -0,0 +1,133 @@
+# app/services/working_calendar.py
+import threading
+from datetime import date, timedelta
+from app.extensions import db
+from app.models.holiday import Holiday
+from app.utils.cache import TTLCache
+
+
+class YearCalendar:
+    """
+    Working-day index for one (year, location).
+
+    ``prefix[i]`` is the number of working days among the first ``i`` days of
+    the year, so counting any range is a single subtraction. ``next_working``
+    / ``prev_working`` give the nearest working day index in O(1), which the
+    sandwich rule uses to trim non-working days at the edges of a range.
+    """
+
+    def __init__(self, year, holidays, weekend_days):
+        self.year = year
+        self.first_day = date(year, 1, 1)
+        n = (date(year + 1, 1, 1) - self.first_day).days
+
+        working = [
+            (self.first_day + timedelta(days=i)).weekday() not in weekend_days
+            for i in range(n)
+        ]
+        for h in holidays:
+            working[(h - self.first_day).days] = False
+
+        self.prefix = [0] * (n + 1)
+        for i, is_working in enumerate(working):
+            self.prefix[i + 1] = self.prefix[i] + is_working
+
+        # n / -1 are "no working day" sentinels
+        self.next_working = [n] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            self.next_working[i] = i if working[i] else self.next_working[i + 1]
+        self.prev_working = [-1] * n
+        for i in range(n):
+            self.prev_working[i] = i if working[i] else (self.prev_working[i - 1] if i else -1)
+
+        self.days = n
+
+    def index(self, d):
+        return (d - self.first_day).days
+
+    def count(self, start_idx, end_idx):
+        return self.prefix[end_idx + 1] - self.prefix[start_idx]
+
+
+class WorkingCalendar:
+    """
+    Per-process cache of YearCalendar objects keyed by (year, location).
+
+    ``invalidate()`` clears this process immediately; entries expire after
+    HOLIDAY_CACHE_TTL seconds so holiday writes made through other workers
+    apply within the same bound as the cached /holidays lists.
+    """
+
+    def __init__(self, ttl=60):
+        self._calendars = TTLCache(ttl, maxsize=64)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def init_app(self, app):
+        self._calendars.ttl = app.config.get("HOLIDAY_CACHE_TTL", 60)
+
+    def get(self, year, location=None):
+        key = (year, location or "All")
+        calendar = self._calendars.get(key)
+        if calendar is None:
+            generation = self._generation
+            calendar = self._build(year, key[1])
+            with self._lock:
+                # Built from holidays read before an invalidate(): use it once, don't cache it
+                if generation == self._generation:
+                    self._calendars.set(key, calendar)
+        return calendar
+
+    def invalidate(self):
+        """Drop every cached year; call after any holiday is created or deleted."""
+        with self._lock:
+            self._generation += 1
+            self._calendars.invalidate()
+
+    def _build(self, year, location):
+        from app.services.leave_calculator import WEEKEND_DAYS
+
+        locations = {location, "All"}
+        holidays = db.session.query(Holiday.date).filter(
+            Holiday.date >= date(year, 1, 1),
+            Holiday.date < date(year + 1, 1, 1),
+            Holiday.location.in_(locations)
+        ).all()
+        return YearCalendar(year, [h.date for h in holidays], WEEKEND_DAYS)
+
+    def _spans(self, start_date, end_date, location):
+        """Yield (calendar, start_idx, end_idx) for each year the range touches."""
+        for year in range(start_date.year, end_date.year + 1):
+            calendar = self.get(year, location)
+            start_idx = calendar.index(max(start_date, calendar.first_day))
+            end_idx = calendar.index(min(end_date, date(year, 12, 31)))
+            yield calendar, start_idx, end_idx
+
+    def count_working_days(self, start_date, end_date, location=None):
+        if start_date > end_date:
+            return 0
+        return sum(
+            calendar.count(start_idx, end_idx)
+            for calendar, start_idx, end_idx in self._spans(start_date, end_date, location)
+        )
+
+    def first_working_day(self, start_date, end_date, location=None):
+        for calendar, start_idx, end_idx in self._spans(start_date, end_date, location):
+            idx = calendar.next_working[start_idx]
+            if idx <= end_idx:
+                return calendar.first_day + timedelta(days=idx)
+        return None
+
+    def last_working_day(self, start_date, end_date, location=None):
+        for calendar, start_idx, end_idx in reversed(list(self._spans(start_date, end_date, location))):
+            idx = calendar.prev_working[end_idx]
+            if idx >= start_idx:
+                return calendar.first_day + timedelta(days=idx)
+        return None
+
+
+working_calendar = WorkingCalendar()
+
+
+def invalidate_calendar():
+    working_calendar.invalidate()
@@ -0,0 +1,117 @@
+from sqlalchemy import func, literal, select, true, update
+from app.extensions import db
+from app.models.leave import LeaveType
+from app.models.ledger import LeaveLedger
+from app.models.user import User
+from app.utils.sql import dialect_insert, greatest, least, new_uuid
+
+
+class YearCloseService:
+    """
+    Year-close carry-forward / encashment, computed for all ledgers at once.
+
+    For each active user's ``year`` ledger the unused balance is split by
+    the leave type's rules: up to ``carry_forward_cap`` days move into next
+    year's total_quota, up to ``encashment_cap`` of the rest are recorded as
+    encashed, and anything left lapses. Every step is a single set-based
+    statement and re-running a close replaces (never adds to) its previous
+    result.
+    """
+
+    @staticmethod
+    def _plan(year):
+        remaining = greatest(LeaveLedger.total_quota - func.coalesce(LeaveLedger.used_days, 0), 0)
+        carry = least(remaining, LeaveType.carry_forward_cap)
+        encash = least(remaining - carry, LeaveType.encashment_cap)
+
+        return select(
+            LeaveLedger.id.label("ledger_id"),
+            LeaveLedger.user_id,
+            LeaveLedger.leave_type_id,
+            LeaveType.name.label("leave_type"),
+            LeaveType.default_quota,
+            remaining.label("remaining"),
+            carry.label("carry"),
+            encash.label("encash")
+        ).join(
+            LeaveType, LeaveType.id == LeaveLedger.leave_type_id
+        ).join(
+            User, User.id == LeaveLedger.user_id
+        ).where(
+            LeaveLedger.year == year,
+            User.is_active.is_(True),
+            LeaveType.is_active.is_(True)
+        ).subquery("plan")
+
+    @staticmethod
+    def summary(year):
+        """Per leave type totals of what closing ``year`` does (or did)."""
+        plan = YearCloseService._plan(year)
+        rows = db.session.execute(
+            select(
+                plan.c.leave_type,
+                func.count(),
+                func.sum(plan.c.remaining),
+                func.sum(plan.c.carry),
+                func.sum(plan.c.encash)
+            ).group_by(plan.c.leave_type).order_by(plan.c.leave_type)
+        ).all()
+
+        return [
+            {
+                "leave_type": name,
+                "ledgers": ledgers,
+                "unused_days": unused or 0,
+                "carried_forward": carried or 0,
+                "encashed": encashed or 0,
+                "lapsed": (unused or 0) - (carried or 0) - (encashed or 0)
+            }
+            for name, ledgers, unused, carried, encashed in rows
+        ]
+
+    @staticmethod
+    def close_year(year):
+        """
+        Close ``year``: upsert ``year + 1`` ledgers with default_quota plus the
+        carried days (keeping any manual adjustments already made to them)
+        and record encashed_days on the closing ledgers. On a re-run the
+        carry is never cut below what ``year + 1`` has already used. Caller commits.
+        Returns the summary report.
+        """
+        plan = YearCloseService._plan(year)
+
+        stmt = dialect_insert(LeaveLedger).from_select(
+            ["id", "user_id", "leave_type_id", "year", "total_quota", "used_days", "carried_forward"],
+            select(
+                new_uuid(),
+                plan.c.user_id,
+                plan.c.leave_type_id,
+                literal(year + 1),
+                plan.c.default_quota + plan.c.carry,
+                literal(0),
+                plan.c.carry
+            ).where(true())  # SQLite needs a WHERE to parse INSERT ... SELECT ... ON CONFLICT
+        )
+        # Swap the previous carry for the new one and leave the rest of the quota
+        # alone. Days already used next year are never taken back: if a smaller
+        # carry would leave used_days above the quota, keep just enough of it.
+        base_quota = LeaveLedger.total_quota - LeaveLedger.carried_forward
+        carried = greatest(stmt.excluded.carried_forward, func.coalesce(LeaveLedger.used_days, 0) - base_quota)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "leave_type_id", "year"],
+            set_={
+                "total_quota": base_quota + carried,
+                "carried_forward": carried
+            }
+        )
+        db.session.execute(stmt)
+
+        db.session.execute(
+            update(LeaveLedger).where(
+                LeaveLedger.id == plan.c.ledger_id
+            ).values(
+                encashed_days=plan.c.encash
+            ).execution_options(synchronize_session=False)
+        )
+
+        return YearCloseService.summary(year)
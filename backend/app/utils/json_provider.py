@@ -0,0 +1,62 @@
+from datetime import date
+from uuid import UUID
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+
+def _default(o):
+    # date covers datetime; ISO 8601 like the .isoformat() strings routes used to build
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, UUID):
+        return str(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    ``app.json`` provider that serializes UUID, date and datetime values
+    directly, so routes can return column values as they come from the
+    database. Uses orjson when it is installed (UUID and dates are then
+    handled natively in C) and the stdlib json module otherwise; both
+    produce the same output apart from whitespace in pretty-printed debug
+    responses. Decimal and other types go through the same ``default``
+    hook as Flask's provider.
+    """
+
+    default = staticmethod(_default)
+
+    def _orjson_options(self, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _pretty(self):
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps(self, obj, **kwargs):
+        # Custom json.dumps arguments (cls=, indent=...) are only honoured by the stdlib path
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        # Bytes straight into the response; no intermediate str
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options(self._pretty()))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # optional: falls back to per-process histograms below
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """
+    Fixed-bucket Prometheus-style histogram keyed by a tuple of label values,
+    used when prometheus_client is not installed. Each worker only knows its
+    own requests, so every series carries a ``pid`` label: scrapes landing on
+    different workers then read different series instead of one that jumps
+    backwards. Aggregate with ``sum without (pid)``.
+    """
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        return _BoundHistogram(self, values)
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+
+        pid = os.getpid()
+        for labels, (counts, total, count) in sorted(series.items()):
+            label_str = ",".join(f'{n}="{v}"' for n, v in zip(self.label_names, labels)) + f',pid="{pid}"'
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label_str},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_str}}} {total}")
+            lines.append(f"{self.name}_count{{{label_str}}} {count}")
+        return lines
+
+
+class _BoundHistogram:
+    def __init__(self, histogram, values):
+        self.histogram = histogram
+        self.values = values
+
+    def observe(self, value):
+        self.histogram.observe(self.values, value)
+
+
+def _histogram(name, help_text, label_names, buckets):
+    if prometheus_client is not None:
+        return prometheus_client.Histogram(name, help_text, label_names, buckets=buckets)
+    return Histogram(name, help_text, label_names, buckets)
+
+
+def multiprocess_dir():
+    """PROMETHEUS_MULTIPROC_DIR when prometheus_client can aggregate all workers through it."""
+    if prometheus_client is None:
+        return None
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
+class RequestMetrics:
+    """
+    Per-process request instrumentation.
+
+    Records wall time, time spent in the database driver and the number of
+    statements for every request, labelled by Flask endpoint, and adds a
+    Server-Timing header so N+1 regressions show up in browser dev tools.
+
+    With prometheus_client installed and PROMETHEUS_MULTIPROC_DIR set (see
+    gunicorn.conf.py), every worker writes to that directory and /metrics
+    reports the sum over all workers, including ones that have exited.
+    Without it, each worker reports its own series with a ``pid`` label.
+    """
+
+    def __init__(self):
+        self.request_seconds = _histogram(
+            "http_request_duration_seconds", "Wall time per request.",
+            ("endpoint", "method", "status"), LATENCY_BUCKETS
+        )
+        self.db_seconds = _histogram(
+            "http_request_db_duration_seconds", "Database time per request.",
+            ("endpoint", "method"), LATENCY_BUCKETS
+        )
+        self.statements = _histogram(
+            "http_request_db_statements", "SQL statements executed per request.",
+            ("endpoint", "method"), STATEMENT_BUCKETS
+        )
+
+    def init_app(self, app):
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _start(self):
+        g.metrics_start = time.perf_counter()
+        g.db_time = 0.0
+        g.db_statements = 0
+
+    def _finish(self, response):
+        start = g.get("metrics_start")
+        if start is None:
+            return response
+
+        wall = time.perf_counter() - start
+        db_time = g.get("db_time", 0.0)
+        statements = g.get("db_statements", 0)
+        endpoint = request.endpoint or "unmatched"
+
+        self.request_seconds.labels(endpoint, request.method, str(response.status_code)).observe(wall)
+        self.db_seconds.labels(endpoint, request.method).observe(db_time)
+        self.statements.labels(endpoint, request.method).observe(statements)
+
+        # Streamed bodies (e.g. /leaves/export) are timed up to the first byte
+        response.headers["Server-Timing"] = (
+            f'app;dur={wall * 1000:.1f}, db;dur={db_time * 1000:.1f};desc="{statements} queries"'
+        )
+        return response
+
+    def render(self):
+        """(body, content type) of the Prometheus text exposition."""
+        if prometheus_client is not None:
+            if multiprocess_dir():
+                registry = prometheus_client.CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry)
+            else:
+                registry = prometheus_client.REGISTRY
+            return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+        lines = []
+        for histogram in (self.request_seconds, self.db_seconds, self.statements):
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n", "text/plain; version=0.0.4; charset=utf-8"
+
+
+request_metrics = RequestMetrics()
+
+
+# ---------- statement timing (every engine) ----------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Stored on the execution context, which is discarded if the statement fails
+    if context is not None:
+        context.metrics_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+
+    if has_request_context() and "db_time" in g:
+        g.db_time += elapsed
+        g.db_statements += 1
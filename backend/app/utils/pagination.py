@@ -0,0 +1,163 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from uuid import UUID
+from flask import request
+from sqlalchemy import DateTime, func, literal, tuple_, type_coerce
+from app.extensions import db
+
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values, direction="next"):
+    """Opaque, URL-safe token holding the sort key of a boundary row."""
+    payload = {
+        "k": [v.isoformat() if isinstance(v, (date, datetime)) else str(v) for v in values],
+        "d": direction
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, columns):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction = payload["d"]
+        raw_values = payload["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+    if direction not in ("next", "prev") or len(raw_values) != len(columns):
+        raise InvalidCursor("Invalid cursor")
+
+    values = []
+    try:
+        for column, value in zip(columns, raw_values):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is date:
+                values.append(date.fromisoformat(value))
+            elif python_type is UUID:
+                values.append(UUID(value))
+            else:
+                values.append(python_type(value))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+    return values, direction
+
+
+def _sort_key(column):
+    """
+    Expression that orders and compares ``column`` the way its values do.
+
+    SQLite keeps DateTime as text: rows written by SQLAlchemy carry
+    ".ffffff" but ``server_default=func.now()`` rows do not, and
+    "12:00:00" < "12:00:00.000000" as strings. Padding the short form makes
+    text order match time order, and cursor values bind in the same format.
+    """
+    if isinstance(column.type, DateTime) and db.engine.dialect.name == "sqlite":
+        padded = column.op("||")(func.substr(".000000", func.length(column) - 18))
+        return type_coerce(padded, column.type)
+    return column
+
+
+class KeysetPage:
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    def meta(self):
+        meta = {
+            "per_page": self.per_page,
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor
+        }
+        if self.total is not None:
+            meta["total"] = self.total
+        return meta
+
+
+def keyset_paginate(query, columns, cursor=None, per_page=20, descending=False, include_total=False):
+    """
+    Seek-based pagination over ``columns`` (a unique sort key, e.g.
+    ``(applied_at, id)``). Unlike ``paginate()`` there is no OFFSET and no
+    COUNT unless ``include_total`` is set, so every page costs the same.
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    total = query.order_by(None).count() if include_total else None
+    sort_keys = [_sort_key(c) for c in columns]
+
+    direction = "next"
+    if cursor:
+        values, direction = decode_cursor(cursor, columns)
+        # Walking backwards flips both the comparison and the sort order
+        backwards = descending if direction == "next" else not descending
+        key = tuple_(*sort_keys)
+        bound = tuple_(*[literal(v, c.type) for v, c in zip(values, columns)])
+        query = query.filter(key < bound if backwards else key > bound)
+
+    reverse_scan = (direction == "prev") != descending
+    query = query.order_by(None).order_by(
+        *[k.desc() if reverse_scan else k.asc() for k in sort_keys]
+    )
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == "prev":
+        rows.reverse()
+
+    def key_of(row):
+        return [getattr(row, c.key) for c in columns]
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if direction == "prev" or has_more:
+            next_cursor = encode_cursor(key_of(rows[-1]), "next")
+        if cursor and (direction == "next" or has_more):
+            prev_cursor = encode_cursor(key_of(rows[0]), "prev")
+
+    return KeysetPage(rows, per_page, next_cursor, prev_cursor, total)
+
+
+def cursor_requested():
+    """Keyset mode is opt-in: any ``cursor`` query arg (even empty) enables it."""
+    return "cursor" in request.args
+
+
+def paginate_request(query, columns, per_page, page=1, descending=False):
+    """Paginate ``query`` in keyset mode when ``cursor`` is present, else with OFFSET."""
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    if cursor_requested():
+        return keyset_paginate(
+            query,
+            columns,
+            cursor=request.args.get("cursor") or None,
+            per_page=per_page,
+            descending=descending,
+            include_total=request.args.get("include_total", "false").lower() in ("1", "true")
+        )
+    return query.paginate(page=page, per_page=per_page, error_out=False)
+
+
+def page_meta(pagination):
+    """Response envelope fields for either pagination mode."""
+    if isinstance(pagination, KeysetPage):
+        return pagination.meta()
+    return {
+        "total": pagination.total,
+        "page": pagination.page,
+        "per_page": pagination.per_page,
+        "pages": pagination.pages
+    }
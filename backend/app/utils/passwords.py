@@ -0,0 +1,89 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = "scrypt"
+
+
+class PasswordVerifierBusy(Exception):
+    """Raised when the verification pool is saturated or a check times out."""
+
+
+def hash_method():
+    return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD)
+
+
+def hash_password(password, method=None):
+    return generate_password_hash(password, method=method or hash_method())
+
+
+def hash_passwords(passwords, method=None, workers=None):
+    """Hash many passwords in parallel (hashlib releases the GIL); returns hashes in input order."""
+    method = method or hash_method()
+    workers = workers or min(len(passwords), os.cpu_count() or 1, 8)
+    if workers <= 1:
+        return [generate_password_hash(p, method=method) for p in passwords]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash") as pool:
+        return list(pool.map(lambda p: generate_password_hash(p, method=method), passwords))
+
+
+_method_prefixes = {}
+
+
+def _method_prefix(method):
+    """Fully expanded method string werkzeug writes for ``method`` (e.g. "scrypt:32768:8:1")."""
+    if method not in _method_prefixes:
+        _method_prefixes[method] = generate_password_hash("", method=method).split("$", 1)[0]
+    return _method_prefixes[method]
+
+
+def needs_rehash(pwhash, method=None):
+    """True if ``pwhash`` was produced with different parameters than the configured ones."""
+    return pwhash.split("$", 1)[0] != _method_prefix(method or hash_method())
+
+
+# ---------- bounded verification pool ----------
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Created lazily so each (forked) worker process gets its own threads
+                _slots = threading.BoundedSemaphore(workers * 4)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwverify")
+    return _executor, _slots
+
+
+def verify_password(pwhash, password):
+    """
+    Check ``password`` against ``pwhash``.
+
+    With PASSWORD_VERIFY_WORKERS > 0 the hash runs on a small bounded pool
+    (hashlib releases the GIL), capping concurrent hashing per process and
+    failing fast with PasswordVerifierBusy instead of queueing unboundedly.
+    """
+    workers = current_app.config.get("PASSWORD_VERIFY_WORKERS", 0)
+    if not workers:
+        return check_password_hash(pwhash, password)
+
+    timeout = current_app.config.get("PASSWORD_VERIFY_TIMEOUT", 5)
+    executor, slots = _get_executor(workers)
+
+    if not slots.acquire(timeout=timeout):
+        raise PasswordVerifierBusy("Password verification queue is full")
+    try:
+        future = executor.submit(check_password_hash, pwhash, password)
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        raise PasswordVerifierBusy("Password verification timed out")
+    finally:
+        slots.release()
@@ -1,20 +1,61 @@
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from uuid import UUID
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, get_jwt_identity
 from flask import jsonify
 
-def role_required(role_name):
+# One bit per role; a user's roles fit in a single int (auth-state cache)
+ROLE_BITS = {
+    "EMPLOYEE": 1,
+    "HR": 2,
+    "MANAGER": 4,
+    "ADMIN": 8,
+}
+
+
+def roles_to_mask(role_names):
+    mask = 0
+    for name in role_names:
+        mask |= ROLE_BITS.get(name, 0)
+    return mask
+
+
+def mask_to_roles(mask):
+    return [name for name, bit in ROLE_BITS.items() if mask & bit]
+
+
+def mask_has_role(mask, role_name):
+    return bool(mask & ROLE_BITS.get(role_name, 0))
+
+
+def current_role_mask(fresh=False):
+    """
+    Role mask of the authenticated user from the auth-state cache (no DB hit
+    when warm). ``fresh=True`` reads the database instead, so a role removed
+    through another worker is not honoured for up to AUTH_STATE_CACHE_TTL.
+    """
+    from app.services.auth_state import get_auth_state, refresh_auth_state
+
+    identity = get_jwt_identity()
+    user_id = identity if isinstance(identity, UUID) else UUID(identity)
+    state = refresh_auth_state(user_id) if fresh else get_auth_state(user_id)
+    if state is None:
+        return roles_to_mask(get_jwt().get("roles", []))
+    return state.role_mask
+
+
+def role_required(role_name, fresh=False):
+    """``fresh=True`` for admin mutations: check the roles in the database, not the cache."""
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
-            claims = get_jwt()
-            user_roles = claims.get("roles", [])
+            mask = current_role_mask(fresh)
 
             # Admin can access everything
-            if "ADMIN" in user_roles:
+            if mask_has_role(mask, "ADMIN"):
                 return fn(*args, **kwargs)
 
-            if role_name not in user_roles:
+            if not mask_has_role(mask, role_name):
                 return jsonify({"message": "Forbidden"}), 403
 
             return fn(*args, **kwargs)
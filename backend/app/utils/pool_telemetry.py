@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Per-process counters fed by TimedQueuePool and pool events."""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self._waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+
+    def incr(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def wait_summary(self):
+        with self._lock:
+            waits = sorted(self._waits)
+        if not waits:
+            return {"samples": 0}
+
+        def pct(p):
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 2)
+
+        return {
+            "samples": len(waits),
+            "avg_ms": round(sum(waits) / len(waits) * 1000, 2),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_wait * 1000, 2)
+        }
+
+    def snapshot(self, pool):
+        stats = {
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait": self.wait_summary()
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0)
+            )
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.incr("timeouts")
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+@event.listens_for(TimedQueuePool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats.incr("checkouts")
+
+
+@event.listens_for(TimedQueuePool, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_stats.incr("connects")
+
+
+@event.listens_for(TimedQueuePool, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_stats.incr("invalidations")
+
+
+def init_app(app):
+    """Use TimedQueuePool for pooled (non-SQLite) engines. Call before db.init_app."""
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if "pool_size" in options:
+        options.setdefault("poolclass", TimedQueuePool)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
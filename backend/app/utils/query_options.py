@@ -0,0 +1,24 @@
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.models.leave_request import LeaveRequest
+from app.models.user import User
+
+
+def leave_listing_query(*columns):
+    """Column query over LeaveRequest joined to its user and leave type.
+
+    Label ``columns`` with the response keys: each row is then a named tuple
+    whose ``_asdict()`` is the payload item, with UUIDs and dates left for
+    the JSON provider, and no ORM objects are built for the page.
+    """
+    return (
+        db.session.query(*columns)
+        .select_from(LeaveRequest)
+        .join(LeaveRequest.user)
+        .join(LeaveRequest.leave_type)
+    )
+
+
+def user_listing_options():
+    """Loader options for listing User rows with their roles (one extra IN query per page)."""
+    return (selectinload(User.roles),)
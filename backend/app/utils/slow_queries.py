@@ -0,0 +1,146 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_CHARS = 4000
+MAX_PARAM_CHARS = 200
+
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b")
+# Functions with side effects (sequences, advisory locks, sleeps, large objects, dblink)
+_SIDE_EFFECT_CALL = re.compile(r"\b(NEXTVAL|SETVAL|PG_\w*ADVISORY\w*|PG_SLEEP\w*|LO_\w+|DBLINK\w*)\s*\(")
+
+
+def _safe_params(statement, parameters):
+    """Printable copy of the bound parameters; credentials are never kept."""
+    if "password" in statement.lower():
+        return "[redacted]"
+    if isinstance(parameters, dict):
+        return {k: repr(v)[:MAX_PARAM_CHARS] for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [repr(v)[:MAX_PARAM_CHARS] for v in parameters]
+    return repr(parameters)[:MAX_PARAM_CHARS]
+
+
+def _explainable(statement):
+    """
+    Plain reads from tables only. Row-locking SELECTs and function-call
+    SELECTs (``SELECT pg_try_advisory_xact_lock(...)``, ``SELECT nextval(...)``)
+    would take locks or change state again under ANALYZE.
+    """
+    sql = statement.lstrip().upper()
+    return (
+        sql.startswith("SELECT")
+        and re.search(r"\bFROM\b", sql) is not None
+        and not _LOCKING_CLAUSE.search(sql)
+        and not _SIDE_EFFECT_CALL.search(sql)
+    )
+
+
+def _explain_prefix(analyze):
+    return "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of statements slower than SLOW_QUERY_MS, with the endpoint
+    that issued them and, for SELECTs on Postgres, an ``EXPLAIN`` plan.
+    The plan is estimated only unless SLOW_QUERY_EXPLAIN_ANALYZE is set:
+    ``EXPLAIN (ANALYZE, BUFFERS)`` runs the slow statement a second time.
+
+    Plans are captured off the request thread on a separate pooled
+    connection, inside a transaction that is always rolled back. At most
+    one EXPLAIN runs at a time per process; slow statements arriving while
+    one is in flight are logged without a plan.
+    """
+
+    def __init__(self):
+        self.threshold = 0
+        self.explain = False
+        self.explain_analyze = False
+        self.explain_timeout_ms = 10000
+        self.entries = deque(maxlen=100)
+        self._explaining = threading.Lock()
+        self._executor = None
+
+    def init_app(self, app):
+        self.threshold = app.config.get("SLOW_QUERY_MS", 0) / 1000
+        self.explain = app.config.get("SLOW_QUERY_EXPLAIN", True)
+        self.explain_analyze = app.config.get("SLOW_QUERY_EXPLAIN_ANALYZE", False)
+        self.explain_timeout_ms = app.config.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 10000)
+        self.entries = deque(self.entries, maxlen=app.config.get("SLOW_QUERY_BUFFER", 100))
+
+    def snapshot(self):
+        """Entries newest first."""
+        return list(reversed(self.entries))
+
+    def record(self, conn, statement, parameters, seconds, executemany):
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(seconds * 1000, 2),
+            "statement": statement[:MAX_STATEMENT_CHARS],
+            "parameters": _safe_params(statement, parameters),
+            "endpoint": request.endpoint if has_request_context() else None,
+            "path": request.path if has_request_context() else None,
+            "plan": None
+        }
+        self.entries.append(entry)
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s",
+            entry["duration_ms"], entry["endpoint"] or "-", entry["statement"][:200]
+        )
+
+        if (
+            self.explain
+            and not executemany
+            and conn.dialect.name == "postgresql"
+            and _explainable(statement)
+            and self._explaining.acquire(blocking=False)
+        ):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slowquery-explain")
+            self._executor.submit(self._explain, conn.engine, entry, statement, parameters)
+
+    def _explain(self, engine, entry, statement, parameters):
+        try:
+            # Raw DBAPI cursor: bypasses engine events, so the EXPLAIN is not itself recorded
+            raw = engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                cursor.execute(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                cursor.execute(_explain_prefix(self.explain_analyze) + statement, parameters)
+                entry["plan"] = "\n".join(row[0] for row in cursor.fetchall())
+            finally:
+                raw.rollback()
+                raw.close()
+        except Exception as e:
+            entry["plan"] = f"EXPLAIN failed: {e}"
+        finally:
+            self._explaining.release()
+
+
+slow_query_log = SlowQueryLog()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if slow_query_log.threshold and context is not None:
+        context.slow_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "slow_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    if elapsed >= slow_query_log.threshold:
+        slow_query_log.record(conn, statement, parameters, elapsed, executemany)
@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+
+
+def dialect_insert(model):
+    """INSERT construct supporting ON CONFLICT for the active database (Postgres, or SQLite in tests)."""
+    if db.engine.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def is_postgres():
+    return db.engine.dialect.name == "postgresql"
+
+
+def greatest(*args):
+    """GREATEST() on Postgres, multi-argument max() on SQLite."""
+    return func.max(*args) if db.engine.dialect.name == "sqlite" else func.greatest(*args)
+
+
+def least(*args):
+    """LEAST() on Postgres, multi-argument min() on SQLite."""
+    return func.min(*args) if db.engine.dialect.name == "sqlite" else func.least(*args)
+
+
+def new_uuid():
+    """SQL expression generating a UUID primary key server-side, for INSERT ... SELECT."""
+    if db.engine.dialect.name == "sqlite":
+        # Matches how SQLAlchemy stores UUID(as_uuid=True) on SQLite: 32 hex chars
+        return func.lower(func.hex(func.randomblob(16)))
+    return func.gen_random_uuid()
+
+
+def try_advisory_xact_lock(key):
+    """
+    Take a transaction-scoped Postgres advisory lock for ``key`` without
+    waiting. Returns False if another session holds it; the lock is released
+    at commit/rollback. Always True on other databases.
+    """
+    if not is_postgres():
+        return True
+    return db.session.scalar(select(func.pg_try_advisory_xact_lock(key)))
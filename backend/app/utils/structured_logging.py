@@ -0,0 +1,158 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id", "sampled"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id, extras, exc_info."""
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None)
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class _RecordQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback separate instead of folding it into the message."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamp the current request id on each record and sample DEBUG records.
+
+    Attached to the QueueHandler, so it runs on the thread that logs, where
+    flask.g is still available. ``debug_sample_rate`` keeps that fraction of
+    DEBUG records; pass ``extra={"sampled": False}`` to always keep one.
+    """
+
+    def __init__(self, debug_sample_rate=1.0):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record):
+        if (
+            record.levelno == logging.DEBUG
+            and self.debug_sample_rate < 1.0
+            and getattr(record, "sampled", True)
+            and random.random() >= self.debug_sample_rate
+        ):
+            return False
+        record.request_id = g.get("request_id") if has_request_context() else None
+        return True
+
+
+class _Pipeline:
+    """The process-wide queue, its handler and the background listener."""
+
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+        self.output = None
+
+    def start(self):
+        # The handler keeps its filters; only the queue and thread are new (also after fork)
+        log_queue = queue.SimpleQueue()
+        self.handler.queue = log_queue
+        self.listener = QueueListener(log_queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+
+
+_pipeline = _Pipeline()
+
+
+def _parse_levels(spec):
+    """Parse LOG_LEVELS, e.g. "app.routes.leave=DEBUG,sqlalchemy.engine=WARNING"."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def init_app(app):
+    """
+    Route all logging through a QueueHandler so request threads only enqueue;
+    a QueueListener thread formats and writes to stderr. Configured once per
+    process; later calls (e.g. a second app in tests) only add the request id hooks.
+    """
+    if _pipeline.handler is None:
+        output = logging.StreamHandler(sys.stderr)
+        if app.config.get("LOG_FORMAT", "json") == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+
+        handler = _RecordQueueHandler(queue.SimpleQueue())
+        handler.addFilter(RequestContextFilter(app.config.get("LOG_DEBUG_SAMPLE_RATE", 1.0)))
+
+        _pipeline.handler = handler
+        _pipeline.output = output
+        _pipeline.start()
+        atexit.register(_pipeline.stop)
+        # The listener thread does not survive fork (gunicorn --preload)
+        os.register_at_fork(after_in_child=_pipeline.start)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(app.config.get("LOG_LEVEL", "INFO").upper())
+        for name, level in _parse_levels(app.config.get("LOG_LEVELS")).items():
+            logging.getLogger(name).setLevel(level)
+
+    # Let app.logger records propagate to the root queue instead of Flask's stream handler
+    app.logger.removeHandler(default_handler)
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+    @app.after_request
+    def echo_request_id(response):
+        if "request_id" in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
@@ -0,0 +1,215 @@
+"""
+Latency benchmark for the hot-query indexes.
+
+Seeds a synthetic dataset (optional) and times the queries behind
+/leaves/apply, /leaves/my, /leaves/pending and /holidays, first with the
+indexes in place and then with them dropped inside a transaction that is
+rolled back afterwards.
+
+Run it against a scratch Postgres database only:
+
+    DATABASE_URL=postgresql://.../leave_bench python benchmarks/bench_indexes.py --seed
+
+A scratch SQLite file (schema from ``--create-schema``) also works when no
+Postgres is at hand. SQLite builds the partial index as a full index and
+ignores INCLUDE columns, so treat those numbers as indicative only, and
+its driver commits the DROP INDEX statements: use a throwaway file.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_, select, text
+
+from app import create_app
+from app.extensions import db
+from app.models import LeaveRequest, LeaveType, User
+from app.models.holiday import Holiday
+
+INDEXES = [
+    "ix_leave_requests_user_status_dates",
+    "ix_leave_requests_user_applied_at_id",
+    "ix_leave_requests_applied_at_id",
+    "ix_leave_requests_status_applied_at",
+    "ix_leave_requests_pending_applied_at_id",
+    "ix_leave_requests_start_date",
+    "ix_leave_ledger_year_user",
+    "ix_users_full_name_id",
+    "ix_holidays_location_date",
+    "ix_user_roles_role_user",
+]
+
+STATUSES = ["APPROVED"] * 6 + ["REJECTED", "CANCELLED", "PENDING"]
+
+
+def seed(employees, years, leaves_per_year):
+    leave_types = LeaveType.query.all()
+    if not leave_types:
+        raise SystemExit("No leave types found. Run seeds/seed_master_data.py first")
+
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"bench{i}@nexus.test",
+            "full_name": f"Bench Employee {i}",
+            "location": random.choice(["Pune", "Ahmedabad"]),
+            "password_hash": "x",
+            "is_active": True,
+        }
+        for i in range(employees)
+    ]
+    db.session.execute(User.__table__.insert(), users)
+
+    this_year = date.today().year
+    batch = []
+    for u in users:
+        for y in range(this_year - years + 1, this_year + 1):
+            # (user, type, start, end) is unique: one request per start day
+            starts = random.sample(range(361), leaves_per_year)
+            for offset in starts:
+                start = date(y, 1, 1) + timedelta(days=offset)
+                days = random.randint(1, 4)
+                batch.append({
+                    "id": uuid.uuid4(),
+                    "user_id": u["id"],
+                    "leave_type_id": random.choice(leave_types).id,
+                    "start_date": start,
+                    "end_date": start + timedelta(days=days - 1),
+                    "total_days": days,
+                    "status": random.choice(STATUSES),
+                    "reason": "benchmark",
+                    "applied_at": datetime(y, 1, 1) + timedelta(minutes=random.randint(0, 500000)),
+                })
+                if len(batch) >= 5000:
+                    db.session.execute(LeaveRequest.__table__.insert(), batch)
+                    batch = []
+    if batch:
+        db.session.execute(LeaveRequest.__table__.insert(), batch)
+
+    holidays = [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Holiday {i}",
+            "date": date(this_year - years + 1, 1, 1) + timedelta(days=i * 7),
+            "location": random.choice(["Pune", "Ahmedabad", "All"]),
+        }
+        for i in range(years * 52)
+    ]
+    db.session.execute(Holiday.__table__.insert(), holidays)
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+    print(f"Seeded {employees} employees, {employees * years * leaves_per_year} leave requests")
+
+
+def hot_queries(user_ids):
+    """Statements shaped exactly like the ones the routes/services issue."""
+    def overlap(conn):
+        start = date.today() + timedelta(days=random.randint(-300, 300))
+        conn.execute(
+            select(LeaveRequest.id).where(
+                LeaveRequest.user_id == random.choice(user_ids),
+                LeaveRequest.status.in_(["PENDING", "APPROVED"]),
+                ~or_(LeaveRequest.end_date < start, LeaveRequest.start_date > start + timedelta(days=3))
+            ).limit(1)
+        ).all()
+
+    def my_leaves(conn):
+        conn.execute(
+            select(LeaveRequest).where(LeaveRequest.user_id == random.choice(user_ids))
+            .order_by(LeaveRequest.applied_at.desc()).limit(10)
+        ).all()
+
+    def pending(conn):
+        conn.execute(
+            select(LeaveRequest).where(LeaveRequest.status == "PENDING")
+            .order_by(LeaveRequest.applied_at.desc()).limit(20)
+        ).all()
+
+    def holidays(conn):
+        location = random.choice(["Pune", "Ahmedabad"])
+        conn.execute(
+            select(Holiday).where(or_(Holiday.location == location, Holiday.location == "All"))
+            .order_by(Holiday.date.desc())
+        ).all()
+
+    return {"overlap_check": overlap, "my_leaves": my_leaves, "pending": pending, "holidays": holidays}
+
+
+def measure(conn, queries, iterations):
+    results = {}
+    for name, fn in queries.items():
+        timings = []
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn(conn)
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+        results[name] = (
+            statistics.median(timings),
+            timings[int(len(timings) * 0.95) - 1],
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="insert a synthetic dataset first")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--leaves-per-year", type=int, default=12)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--create-schema", action="store_true",
+                        help="SQLite only: create the tables and the Planned/Emergency leave types")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            raise SystemExit("This benchmark needs PostgreSQL (or SQLite for indicative numbers)")
+
+        if args.create_schema:
+            if dialect != "sqlite":
+                raise SystemExit("--create-schema is for SQLite; run `flask db upgrade` on Postgres")
+            db.create_all()
+            db.session.add_all([
+                LeaveType(name="Planned Leave", default_quota=18),
+                LeaveType(name="Emergency Leave", default_quota=5),
+            ])
+            db.session.commit()
+
+        if args.seed:
+            seed(args.employees, args.years, args.leaves_per_year)
+
+        user_ids = [row[0] for row in db.session.execute(select(User.id)).all()]
+        queries = hot_queries(user_ids)
+
+        with db.engine.connect() as conn:
+            with_idx = measure(conn, queries, args.iterations)
+            # End the transaction the reads autobegan
+            conn.rollback()
+
+            trans = conn.begin()
+            for name in INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            without_idx = measure(conn, queries, args.iterations)
+            trans.rollback()
+
+    print(f"{dialect}, {len(user_ids)} users, {args.iterations} iterations per query")
+    print(f"{'query':<16}{'p50 no-idx':>12}{'p95 no-idx':>12}{'p50 idx':>10}{'p95 idx':>10}")
+    for name in queries:
+        n50, n95 = without_idx[name]
+        i50, i95 = with_idx[name]
+        print(f"{name:<16}{n50:>10.2f}ms{n95:>10.2f}ms{i50:>8.2f}ms{i95:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
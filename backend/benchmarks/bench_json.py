@@ -0,0 +1,145 @@
+"""
+Serialization benchmark for one 1,000-row /leaves/all page.
+
+Compares the previous path (ORM objects, every UUID/date stringified in
+Python, Flask's stdlib provider) with row tuples handed to
+FastJSONProvider, once with orjson and once with its stdlib fallback.
+Only building the items and the response body is timed; no database needed.
+
+    python benchmarks/bench_json.py --rows 1000 --repeat 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.config insists on a database URL at import time; nothing connects to it here
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+# Same columns and labels as the /leaves/all query
+AllLeavesRow = namedtuple("AllLeavesRow", [
+    "leave_id", "employee_name", "employee_email", "leave_type", "start_date", "end_date",
+    "total_days", "status", "reason", "rejection_reason", "applied_at", "processed_at"
+])
+
+
+def make_rows(n):
+    rng = random.Random(42)
+    leave_types = [SimpleNamespace(id=uuid.uuid4(), name=name) for name in ("Planned Leave", "Emergency Leave")]
+    users = [
+        SimpleNamespace(id=uuid.uuid4(), full_name=f"Employee {i:04d}", email=f"emp{i}@nexus.com")
+        for i in range(200)
+    ]
+    objects, rows = [], []
+    for i in range(n):
+        start = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        applied = datetime(2025, 12, 1) + timedelta(seconds=rng.randrange(10_000_000), microseconds=rng.randrange(10**6))
+        status = rng.choice(["PENDING", "APPROVED", "REJECTED"])
+        leave = SimpleNamespace(
+            id=uuid.uuid4(), user=rng.choice(users), leave_type=rng.choice(leave_types),
+            start_date=start, end_date=start + timedelta(days=rng.randrange(5)), total_days=rng.randrange(1, 6),
+            status=status, reason=f"reason {i}", rejection_reason="overlaps release" if status == "REJECTED" else None,
+            applied_at=applied, processed_at=applied + timedelta(hours=5) if status != "PENDING" else None
+        )
+        objects.append(leave)
+        rows.append(AllLeavesRow(
+            leave.id, leave.user.full_name, leave.user.email, leave.leave_type.name, leave.start_date,
+            leave.end_date, leave.total_days, leave.status, leave.reason, leave.rejection_reason,
+            leave.applied_at, leave.processed_at
+        ))
+    return objects, rows
+
+
+def stringified_items(objects):
+    # The per-field conversion /leaves/all used to do
+    return [
+        {
+            "leave_id": str(l.id),
+            "employee_name": l.user.full_name,
+            "employee_email": l.user.email,
+            "leave_type": l.leave_type.name,
+            "start_date": l.start_date.isoformat(),
+            "end_date": l.end_date.isoformat(),
+            "total_days": l.total_days,
+            "status": l.status,
+            "reason": l.reason,
+            "rejection_reason": l.rejection_reason,
+            "applied_at": l.applied_at.isoformat() if l.applied_at else None,
+            "processed_at": l.processed_at.isoformat() if l.processed_at else None
+        }
+        for l in objects
+    ]
+
+
+def row_items(rows):
+    return [row._asdict() for row in rows]
+
+
+def timed(app, build, source, repeat):
+    samples = []
+    body = None
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = app.json.response({"items": build(source), "total": len(source)}).get_data()
+            samples.append(time.perf_counter() - start)
+    return samples, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    objects, rows = make_rows(args.rows)
+
+    stdlib_app = Flask("bench_stdlib")
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    fast_app = Flask("bench_fast")
+    fast_app.json = FastJSONProvider(fast_app)
+
+    cases = [("stringified dicts + stdlib jsonify", stdlib_app, stringified_items, objects)]
+    orjson_module = json_provider.orjson
+    if orjson_module is not None:
+        cases.append(("row tuples + FastJSONProvider (orjson)", fast_app, row_items, rows))
+    else:
+        print("orjson is not installed; only the stdlib fallback is measured")
+
+    results = []
+    for name, app, build, source in cases:
+        results.append((name, *timed(app, build, source, args.repeat)))
+
+    # Same provider with orjson switched off
+    json_provider.orjson = None
+    try:
+        results.append(("row tuples + FastJSONProvider (stdlib)", *timed(fast_app, row_items, rows, args.repeat)))
+    finally:
+        json_provider.orjson = orjson_module
+
+    reference = results[0][2]
+    baseline = statistics.median(results[0][1])
+    print(f"{args.rows} rows, {args.repeat} runs each")
+    print(f"{'path':<42}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>10}{'same body':>11}")
+    for name, samples, body in results:
+        samples.sort()
+        p50 = statistics.median(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{name:<42}{p50 * 1000:>10.2f}{p95 * 1000:>10.2f}{baseline / p50:>9.1f}x{str(body == reference):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Login hashing micro-benchmark: password verifications per second on one
+core for each PASSWORD_HASH_METHOD candidate, plus the aggregate rate when
+verifying on a thread pool of the given size.
+
+    python benchmarks/bench_password_hash.py [--seconds 3] [--threads 4]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+METHODS = [
+    "scrypt:32768:8:1",  # werkzeug default
+    "scrypt:16384:8:1",
+    "pbkdf2:sha256:1000000",  # werkzeug default for pbkdf2
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:260000",
+]
+
+
+def rate(pwhash, seconds):
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        check_password_hash(pwhash, "correct horse battery staple")
+        done += 1
+    return done / seconds
+
+
+def pooled_rate(pwhash, seconds, threads):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        counts = pool.map(lambda _: rate(pwhash, seconds), range(threads))
+        return sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'method':<24}{'logins/s/core':>15}{f'pool x{args.threads}':>12}")
+    for method in METHODS:
+        pwhash = generate_password_hash("correct horse battery staple", method=method)
+        single = rate(pwhash, args.seconds)
+        pooled = pooled_rate(pwhash, args.seconds, args.threads)
+        print(f"{method:<24}{single:>15.1f}{pooled:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
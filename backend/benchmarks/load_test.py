@@ -0,0 +1,102 @@
+"""
+HTTP load test for a running server (e.g. gunicorn behind docker compose).
+
+Logs in once, then keeps --concurrency threads issuing GETs against the
+given paths for --seconds and reports throughput and latency per path.
+Standard library only, so it runs from any machine with Python.
+
+    python benchmarks/load_test.py --base-url http://localhost:5000 \
+        --email hr@nexus.com --password hr123 --concurrency 32 --seconds 30 \
+        --path /leaves/pending --path "/leaves/all?per_page=50" --path /holidays
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+DEFAULT_PATHS = ["/leaves/pending", "/leaves/all?per_page=50", "/leaves/types", "/holidays"]
+
+
+def login(base_url, email, password):
+    request = urllib.request.Request(
+        f"{base_url}/auth/login",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["access_token"]
+
+
+def worker(base_url, paths, token, deadline, offset, results, lock):
+    headers = {"Authorization": f"Bearer {token}"}
+    local = defaultdict(lambda: {"latencies": [], "errors": 0})
+    i = offset
+
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(base_url + path, headers=headers)) as response:
+                response.read()
+            local[path]["latencies"].append(time.perf_counter() - start)
+        except (urllib.error.URLError, ConnectionError):
+            local[path]["errors"] += 1
+
+    with lock:
+        for path, stats in local.items():
+            results[path]["latencies"].extend(stats["latencies"])
+            results[path]["errors"] += stats["errors"]
+
+
+def pct(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--email", default="hr@nexus.com")
+    parser.add_argument("--password", default="hr123")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--path", action="append", dest="paths", help="Repeatable; defaults to a mix of HR reads")
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    token = login(args.base_url, args.email, args.password)
+
+    results = defaultdict(lambda: {"latencies": [], "errors": 0})
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(args.base_url, paths, token, deadline, n, results, lock))
+        for n in range(args.concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.concurrency} clients, {elapsed:.1f}s against {args.base_url}")
+    print(f"{'path':<32}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    total = 0
+    for path in paths:
+        latencies = sorted(results[path]["latencies"])
+        total += len(latencies)
+        print(
+            f"{path:<32}{len(latencies) / elapsed:>10.1f}{pct(latencies, 0.50):>10.1f}"
+            f"{pct(latencies, 0.95):>10.1f}{pct(latencies, 0.99):>10.1f}{results[path]['errors']:>8}"
+        )
+    print(f"{'total':<32}{total / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
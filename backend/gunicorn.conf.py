@@ -0,0 +1,80 @@
+"""
+Production server settings: ``gunicorn -c gunicorn.conf.py``
+
+Every value can be overridden from the environment (see README). The app
+is imported once in the master (preload) and forked into workers; each
+worker then drops the inherited SQLAlchemy connections and opens its own.
+
+Reloads: ``kill -HUP <master>`` restarts workers gracefully, but with
+preload the code is not re-imported. To deploy new code, start a new
+master with ``kill -USR2`` and then stop the old one with ``kill -QUIT``,
+or set GUNICORN_PRELOAD=false so HUP reloads the code too.
+"""
+import multiprocessing
+import os
+import shutil
+
+wsgi_app = "manage:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# gthread: threads share one process and its connection pool (default).
+# gevent: needs `pip install gevent psycogreen` (see post_fork); run it with
+# GUNICORN_PRELOAD=false so the app is imported after gevent's monkey-patching.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+cpus = multiprocessing.cpu_count()
+
+if worker_class == "gevent":
+    workers = int(os.getenv("WEB_CONCURRENCY", cpus))
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 100))
+else:
+    # Threads already overlap DB waits, so one worker per CPU. Each worker's
+    # pool defaults to `threads` connections + 2 overflow (app.config), so a
+    # host opens up to workers x (threads + 2) Postgres connections.
+    workers = int(os.getenv("WEB_CONCURRENCY", cpus))
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Recycle workers periodically (jitter avoids all restarting at once)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Per-worker metric files that /metrics sums (prometheus_client multiprocess
+# mode). Set before the app, and so prometheus_client, is imported.
+metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/nexus-prometheus")
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Application logs already go to stderr as JSON; gunicorn access logs are opt-in
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+
+def on_starting(server):
+    # Files left by a previous master would be summed into the new counts
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+    from manage import app
+    from app.extensions import db
+
+    # Connections opened in the master must not be shared with the children;
+    # close=False leaves them for the master instead of closing its sockets
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,30 @@
+"""Add default_quota to leave_types
+
+Revision ID: a3d9e6b1c572
+Revises: f5c0d8e3a197
+Create Date: 2026-10-18 15:02:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d9e6b1c572'
+down_revision = 'f5c0d8e3a197'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('leave_types', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('default_quota', sa.Integer(), server_default='15', nullable=False))
+
+    # Carry over the quotas that used to be hard-coded in hr.create_employee
+    op.execute("UPDATE leave_types SET default_quota = 18 WHERE name = 'Planned Leave'")
+    op.execute("UPDATE leave_types SET default_quota = 5 WHERE name = 'Emergency Leave'")
+
+
+def downgrade():
+    with op.batch_alter_table('leave_types', schema=None) as batch_op:
+        batch_op.drop_column('default_quota')
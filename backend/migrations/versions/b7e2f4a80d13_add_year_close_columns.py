@@ -0,0 +1,36 @@
+"""Add carry-forward and encashment columns
+
+Revision ID: b7e2f4a80d13
+Revises: a3d9e6b1c572
+Create Date: 2026-10-18 15:40:17.062951
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2f4a80d13'
+down_revision = 'a3d9e6b1c572'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('leave_types', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('carry_forward_cap', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('encashment_cap', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('leave_ledger', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('carried_forward', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('encashed_days', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('leave_ledger', schema=None) as batch_op:
+        batch_op.drop_column('encashed_days')
+        batch_op.drop_column('carried_forward')
+
+    with op.batch_alter_table('leave_types', schema=None) as batch_op:
+        batch_op.drop_column('encashment_cap')
+        batch_op.drop_column('carry_forward_cap')
@@ -0,0 +1,45 @@
+"""Add leave_ledger balance check constraints
+
+Revision ID: c1f8a2d6e934
+Revises: b7e2f4a80d13
+Create Date: 2026-10-18 16:12:35.804417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1f8a2d6e934'
+down_revision = 'b7e2f4a80d13'
+branch_labels = None
+depends_on = None
+
+CHECKS = [
+    ('ck_leave_ledger_used_within_quota', 'used_days <= total_quota'),
+    ('ck_leave_ledger_used_nonnegative', 'used_days >= 0'),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # ADD ... NOT VALID takes ACCESS EXCLUSIVE only briefly (no scan) and the
+        # lock lasts until commit, so the scan runs after it in its own
+        # transaction: VALIDATE holds SHARE UPDATE EXCLUSIVE, which lets
+        # reads and writes continue while existing rows are checked.
+        for name, condition in CHECKS:
+            op.execute(f'ALTER TABLE leave_ledger ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID')
+        with op.get_context().autocommit_block():
+            for name, _ in CHECKS:
+                op.execute(f'ALTER TABLE leave_ledger VALIDATE CONSTRAINT {name}')
+        return
+
+    with op.batch_alter_table('leave_ledger', schema=None) as batch_op:
+        for name, condition in CHECKS:
+            batch_op.create_check_constraint(name, sa.text(condition))
+
+
+def downgrade():
+    with op.batch_alter_table('leave_ledger', schema=None) as batch_op:
+        for name, _ in reversed(CHECKS):
+            batch_op.drop_constraint(name, type_='check')
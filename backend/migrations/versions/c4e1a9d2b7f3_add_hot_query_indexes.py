@@ -0,0 +1,77 @@
+"""Add indexes for hot leave, ledger, holiday and role queries
+
+Revision ID: c4e1a9d2b7f3
+Revises: 7be40227825d
+Create Date: 2026-10-18 10:02:11.418203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1a9d2b7f3'
+down_revision = '7be40227825d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Built CONCURRENTLY so large tables stay writable during the upgrade;
+    # that cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leave_requests_user_status_dates', 'leave_requests',
+            ['user_id', 'status', 'start_date', 'end_date'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_user_applied_at', 'leave_requests',
+            ['user_id', 'applied_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_status_applied_at', 'leave_requests',
+            ['status', 'applied_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_pending_applied_at', 'leave_requests',
+            ['applied_at'],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_start_date', 'leave_requests',
+            ['start_date'],
+            postgresql_include=['status', 'leave_type_id', 'total_days'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_ledger_year_user', 'leave_ledger',
+            ['year', 'user_id'],
+            postgresql_include=['leave_type_id', 'total_quota', 'used_days'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_holidays_location_date', 'holidays',
+            ['location', 'date'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_user_roles_role_user', 'user_roles',
+            ['role_id', 'user_id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_roles_role_user', table_name='user_roles', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_holidays_location_date', table_name='holidays', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_ledger_year_user', table_name='leave_ledger', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_start_date', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_pending_applied_at', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_status_applied_at', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_user_applied_at', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_user_status_dates', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+"""Add leave request overlap exclusion and duplicate unique index
+
+Revision ID: d4a7b9c2f158
+Revises: c1f8a2d6e934
+Create Date: 2026-10-18 16:48:52.190734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7b9c2f158'
+down_revision = 'c1f8a2d6e934'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fails if existing rows already break a rule; resolve those first
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_leave_requests_user_type_dates', 'leave_requests',
+            ['user_id', 'leave_type_id', 'start_date', 'end_date'],
+            unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # btree_gist provides the uuid "=" operator class for the GiST index
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE leave_requests ADD CONSTRAINT ex_leave_requests_no_overlap "
+        "EXCLUDE USING gist (user_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+        "WHERE (status IN ('PENDING', 'APPROVED'))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE leave_requests DROP CONSTRAINT IF EXISTS ex_leave_requests_no_overlap")
+
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_leave_requests_user_type_dates', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,65 @@
+"""Add indexes for keyset pagination on leave and user listings
+
+Revision ID: d8b3f61e0a24
+Revises: c4e1a9d2b7f3
+Create Date: 2026-10-18 11:20:47.903115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f61e0a24'
+down_revision = 'c4e1a9d2b7f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Seek predicates compare (sort_key, id) row values, so the indexes
+    # need the id tail to serve them without a sort.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leave_requests_user_applied_at_id', 'leave_requests',
+            ['user_id', 'applied_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_applied_at_id', 'leave_requests',
+            ['applied_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_pending_applied_at_id', 'leave_requests',
+            ['applied_at', 'id'],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_users_full_name_id', 'users',
+            ['full_name', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Superseded by the *_id variants above
+        op.drop_index('ix_leave_requests_user_applied_at', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_pending_applied_at', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leave_requests_pending_applied_at', 'leave_requests',
+            ['applied_at'],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_leave_requests_user_applied_at', 'leave_requests',
+            ['user_id', 'applied_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_users_full_name_id', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_pending_applied_at_id', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_applied_at_id', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_leave_requests_user_applied_at_id', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,26 @@
+"""Add token_version to users
+
+Revision ID: e2a7c5f914b6
+Revises: d8b3f61e0a24
+Create Date: 2026-10-18 13:05:32.614470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5f914b6'
+down_revision = 'd8b3f61e0a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,52 @@
+"""Add leave_stats_monthly rollup
+
+Revision ID: f5c0d8e3a197
+Revises: e2a7c5f914b6
+Create Date: 2026-10-18 14:21:09.337815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c0d8e3a197'
+down_revision = 'e2a7c5f914b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('leave_stats_monthly',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('leave_type_id', sa.UUID(), nullable=False),
+    sa.Column('location', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('leave_count', sa.Integer(), nullable=False),
+    sa.Column('total_days', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['leave_type_id'], ['leave_types.id'], ),
+    sa.PrimaryKeyConstraint('year', 'month', 'leave_type_id', 'location', 'status')
+    )
+
+    # Backfill from existing history (same query as `flask stats rebuild-monthly`)
+    op.execute("""
+        INSERT INTO leave_stats_monthly
+            (year, month, leave_type_id, location, status, leave_count, total_days)
+        SELECT
+            CAST(EXTRACT(YEAR FROM lr.start_date) AS INTEGER),
+            CAST(EXTRACT(MONTH FROM lr.start_date) AS INTEGER),
+            lr.leave_type_id,
+            COALESCE(u.location, 'Unknown'),
+            lr.status,
+            COUNT(lr.id),
+            COALESCE(SUM(lr.total_days), 0)
+        FROM leave_requests lr
+        JOIN users u ON u.id = lr.user_id
+        WHERE lr.leave_type_id IS NOT NULL AND lr.status IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade():
+    op.drop_table('leave_stats_monthly')
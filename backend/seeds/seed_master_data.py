@@ -12,8 +12,8 @@ def seed_roles():
 
 def seed_leave_types():
     leave_types = [
-        {"name": "Planned Leave", "is_active": True},
-        {"name": "Emergency Leave", "is_active": True},
+        {"name": "Planned Leave", "is_active": True, "default_quota": 18},
+        {"name": "Emergency Leave", "is_active": True, "default_quota": 5},
     ]
 
     for lt in leave_types:
@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+# app.config reads the environment at import time
+_DB_DIR = tempfile.mkdtemp(prefix="nexus-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+os.environ.setdefault("SLOW_QUERY_MS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g
+
+from app import create_app
+from app.extensions import db
+from app.models import LeaveLedger, LeaveType, Role, User
+from app.services.holiday_cache import holiday_cache
+from app.services.reference_data import reference_data
+from app.services.working_calendar import working_calendar
+
+PASSWORD = "secret123"
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        # Module-level caches outlive the per-test database
+        reference_data.invalidate()
+        holiday_cache.bump()
+        working_calendar.invalidate()
+        yield
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def seed():
+    """Roles, two leave types, an admin, an HR user and five employees with ledgers."""
+    roles = {name: Role(name=name) for name in ("EMPLOYEE", "HR", "MANAGER", "ADMIN")}
+    planned = LeaveType(name="Planned Leave", default_quota=18, carry_forward_cap=5, encashment_cap=3)
+    emergency = LeaveType(name="Emergency Leave", default_quota=5)
+    db.session.add_all([*roles.values(), planned, emergency])
+
+    def add_user(email, name, role, location="Pune"):
+        user = User(email=email, full_name=name, location=location)
+        user.set_password(PASSWORD)
+        user.roles.append(roles[role])
+        db.session.add(user)
+        return user
+
+    admin = add_user("admin@nexus.com", "Admin", "ADMIN")
+    hr = add_user("hr@nexus.com", "HR", "HR")
+    employees = [add_user(f"emp{i}@nexus.com", f"Employee {i:02d}", "EMPLOYEE") for i in range(5)]
+    db.session.flush()
+
+    # Next year too, so leaves applied via next_weekday() always find a ledger
+    years = {date.today().year, (date.today() + timedelta(days=90)).year}
+    for user in [admin, hr, *employees]:
+        for leave_type in (planned, emergency):
+            for year in years:
+                db.session.add(LeaveLedger(
+                    user_id=user.id, leave_type_id=leave_type.id, year=year,
+                    total_quota=leave_type.default_quota, used_days=0
+                ))
+    db.session.commit()
+
+    return {"admin": admin, "hr": hr, "employees": employees, "planned": planned, "emergency": emergency}
+
+
+@pytest.fixture
+def login(client):
+    def login(email):
+        response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+    return login
+
+
+def next_weekday(offset):
+    """First Monday-Friday on or after today + ``offset`` days."""
+    day = date.today() + timedelta(days=offset)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+@pytest.fixture
+def apply_leave(client, seed):
+    """POST /leaves/apply for ``headers`` and return the new leave id."""
+    def apply_leave(headers, start, end=None, leave_type=None):
+        response = client.post("/leaves/apply", headers=headers, json={
+            "start_date": start.isoformat(),
+            "end_date": (end or start).isoformat(),
+            "leave_type_id": str((leave_type or seed["planned"]).id),
+            "reason": "test"
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()["leave_id"]
+    return apply_leave
+
+
+@pytest.fixture
+def statement_count(app):
+    """Count the SQL statements one request runs, using the /metrics hook on flask.g."""
+    counts = []
+
+    def record(response):
+        counts.append(g.get("db_statements", 0))
+        return response
+
+    app.after_request_funcs.setdefault(None, []).insert(0, record)
+    yield counts
+    app.after_request_funcs[None].remove(record)
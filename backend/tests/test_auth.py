@@ -0,0 +1,78 @@
+from flask_jwt_extended import decode_token
+
+from app.extensions import db
+from app.models import Role, UserRole
+
+
+def test_token_carries_roles_and_version_but_no_role_mask(app, client, seed, login):
+    headers = login("hr@nexus.com")
+    claims = decode_token(headers["Authorization"].split()[1])
+
+    assert claims["roles"] == ["HR"]
+    assert claims["tv"] == 0
+    assert "rm" not in claims
+
+
+def test_role_removal_applies_to_existing_tokens(client, seed, login):
+    admin = login("admin@nexus.com")
+    hr = login("hr@nexus.com")
+    assert client.get("/leaves/pending", headers=hr).status_code == 200
+
+    response = client.delete(f"/admin/users/{seed['hr'].id}/roles/HR", headers=admin)
+    assert response.status_code == 200
+
+    assert client.get("/leaves/pending", headers=hr).status_code == 403
+
+
+def test_deactivation_revokes_tokens(client, seed, login):
+    admin = login("admin@nexus.com")
+    employee = login("emp0@nexus.com")
+
+    response = client.patch(
+        f"/admin/users/{seed['employees'][0].id}/status", json={"is_active": False}, headers=admin
+    )
+    assert response.status_code == 200
+
+    assert client.get("/leaves/my", headers=employee).status_code == 401
+
+
+def _grant_behind_cache(user, role_name):
+    """Role change made through another worker: this process's cache is not told."""
+    role = Role.query.filter_by(name=role_name).one()
+    db.session.add(UserRole(user_id=user.id, role_id=role.id))
+    db.session.commit()
+
+
+def _revoke_behind_cache(user, role_name):
+    role = Role.query.filter_by(name=role_name).one()
+    UserRole.query.filter_by(user_id=user.id, role_id=role.id).delete()
+    db.session.commit()
+
+
+def test_role_changes_read_the_database_not_the_cache(client, seed, login):
+    admin = login("admin@nexus.com")
+    employee = seed["employees"][0]
+    # Warms the auth-state cache for emp0 with EMPLOYEE only
+    assert client.get("/leaves/my", headers=login("emp0@nexus.com")).status_code == 200
+
+    _grant_behind_cache(employee, "HR")
+    response = client.post(f"/admin/users/{employee.id}/roles", json={"role_name": "HR"}, headers=admin)
+    assert response.status_code == 400
+    assert "already has HR" in response.get_json()["message"]
+
+    response = client.delete(f"/admin/users/{employee.id}/roles/HR", headers=admin)
+    assert response.status_code == 200
+    assert response.get_json()["roles"] == ["EMPLOYEE"]
+
+
+def test_admin_mutations_stop_honouring_a_revoked_admin_role(client, seed, login):
+    _grant_behind_cache(seed["hr"], "ADMIN")
+    hr = login("hr@nexus.com")
+    # Caches HR + ADMIN for the hr user
+    assert client.get("/admin/users", headers=hr).status_code == 200
+
+    _revoke_behind_cache(seed["hr"], "ADMIN")
+    response = client.patch(
+        f"/admin/users/{seed['employees'][0].id}/status", json={"is_active": False}, headers=hr
+    )
+    assert response.status_code == 403
@@ -0,0 +1,99 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import LeaveLedger
+
+from conftest import next_weekday
+
+
+def _monday(offset):
+    day = next_weekday(offset)
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+def _emergency_used(seed, user, year):
+    return db.session.query(LeaveLedger.used_days).filter_by(
+        user_id=user.id, leave_type_id=seed["emergency"].id, year=year
+    ).scalar()
+
+
+def test_bulk_approve_reports_partial_failures(client, seed, login, apply_leave):
+    employee = login("emp0@nexus.com")
+    hr = login("hr@nexus.com")
+    first, second = _monday(14), _monday(21)
+    if first.year != second.year:
+        pytest.skip("both requests must draw on the same year's ledger")
+
+    # Emergency Leave has 5 days: the second 3-day request would overdraw it
+    fits = apply_leave(employee, first, first + timedelta(days=2), seed["emergency"])
+    overdraws = apply_leave(employee, second, second + timedelta(days=2), seed["emergency"])
+    done = apply_leave(employee, _monday(28), leave_type=seed["planned"])
+    assert client.post(f"/leaves/{done}/approve", headers=hr).status_code == 200
+    missing = str(uuid.uuid4())
+
+    response = client.post("/leaves/bulk-approve", headers=hr, json={"leave_ids": [fits, overdraws, done, missing, fits]})
+    assert response.status_code == 200
+    body = response.get_json()
+
+    assert body["succeeded"] == 1
+    assert body["failed"] == 3
+    results = {r["leave_id"]: r for r in body["results"]}
+    assert results[fits] == {"leave_id": fits, "status": "APPROVED"}
+    assert "Insufficient leave balance" in results[overdraws]["error"]
+    assert "error" in results[done]
+    assert "error" in results[missing]
+
+    db.session.expire_all()
+    assert _emergency_used(seed, seed["employees"][0], first.year) == 3
+    statuses = {i["leave_id"]: i["status"] for i in client.get("/leaves/my", headers=employee).get_json()["items"]}
+    assert statuses[overdraws] == "PENDING"
+
+
+def test_bulk_reject_skips_non_pending(client, seed, login, apply_leave):
+    employee = login("emp1@nexus.com")
+    hr = login("hr@nexus.com")
+    pending = apply_leave(employee, _monday(14))
+    approved = apply_leave(employee, _monday(21))
+    assert client.post(f"/leaves/{approved}/approve", headers=hr).status_code == 200
+
+    body = client.post(
+        "/leaves/bulk-reject", headers=hr, json={"leave_ids": [pending, approved], "rejection_reason": "freeze"}
+    ).get_json()
+
+    assert [r.get("status") for r in body["results"]] == ["REJECTED", None]
+    items = {i["leave_id"]: i for i in client.get("/leaves/my", headers=employee).get_json()["items"]}
+    assert items[pending]["rejection_reason"] == "freeze"
+    assert items[approved]["status"] == "APPROVED"
+
+
+def test_bulk_rejects_malformed_ids(client, seed, login):
+    hr = login("hr@nexus.com")
+    assert client.post("/leaves/bulk-approve", headers=hr, json={"leave_ids": []}).status_code == 400
+    assert client.post("/leaves/bulk-approve", headers=hr, json={"leave_ids": ["nope"]}).status_code == 400
+
+
+def test_lock_ledgers_keeps_a_ledger_created_concurrently(seed, monkeypatch):
+    from app.services import leave_ledger_service
+    from app.services.leave_ledger_service import LeaveLedgerService
+
+    planned, emergency = seed["planned"], seed["emergency"]
+    user = seed["employees"][0]
+    raced, fresh = (user.id, planned.id, 2041), (user.id, emergency.id, 2041)
+    leave_type = leave_ledger_service.reference_data.leave_type
+
+    def racing_leave_type(leave_type_id):
+        # Another approval creates one of the missing ledgers meanwhile
+        if not db.session.query(LeaveLedger.id).filter_by(year=2041).count():
+            db.session.add(LeaveLedger(user_id=user.id, leave_type_id=planned.id, year=2041, total_quota=7, used_days=1))
+            db.session.flush()
+        return leave_type(leave_type_id)
+
+    monkeypatch.setattr(leave_ledger_service.reference_data, "leave_type", racing_leave_type)
+    ledgers = LeaveLedgerService.lock_ledgers([fresh, raced])
+
+    assert set(ledgers) == {raced, fresh}
+    assert (ledgers[raced].total_quota, ledgers[raced].used_days) == (7, 1)
+    assert (ledgers[fresh].total_quota, ledgers[fresh].used_days) == (emergency.default_quota, 0)
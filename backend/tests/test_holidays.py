@@ -0,0 +1,36 @@
+from datetime import date
+
+from app.extensions import db
+from app.models.holiday import Holiday
+from app.services.holiday_cache import holiday_cache
+
+
+def test_conditional_get_revalidates_on_content(client, seed, login):
+    headers = login("emp0@nexus.com")
+    db.session.add(Holiday(name="Republic Day", date=date(2030, 1, 26), location="All"))
+    db.session.commit()
+
+    first = client.get("/holidays", headers=headers)
+    assert first.status_code == 200
+    assert first.headers.get("Last-Modified") is None
+    etag = first.headers["ETag"]
+
+    cached = client.get("/holidays", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    # Written through another worker: only the content (and so the ETag) changes
+    db.session.add(Holiday(name="Holi", date=date(2030, 3, 20), location="All"))
+    db.session.commit()
+    holiday_cache.bump()
+
+    fresh = client.get("/holidays", headers={**headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert [h["name"] for h in fresh.get_json()] == ["Holi", "Republic Day"]
+
+
+def test_location_keys_are_bounded(client, seed, login):
+    headers = login("emp0@nexus.com")
+    for i in range(100):
+        assert client.get(f"/holidays?location=Nowhere{i}", headers=headers).status_code == 200
+    assert len(holiday_cache._lists._data) <= holiday_cache._lists.maxsize
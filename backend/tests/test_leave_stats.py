@@ -0,0 +1,66 @@
+from app.extensions import db
+from app.models import LeaveStatsMonthly
+from app.services.leave_stats_service import LeaveStatsService
+
+from conftest import next_weekday
+
+
+def _rollup():
+    return {
+        (r.year, r.month, r.leave_type_id, r.location, r.status): (r.leave_count, r.total_days)
+        for r in db.session.query(LeaveStatsMonthly).all()
+        if r.leave_count or r.total_days
+    }
+
+
+def test_rollup_follows_a_location_change(client, seed, login, apply_leave):
+    employee = login("emp0@nexus.com")
+    hr = login("hr@nexus.com")
+    admin = login("admin@nexus.com")
+
+    approved = apply_leave(employee, next_weekday(20))
+    assert client.post(f"/leaves/{approved}/approve", headers=hr).status_code == 200
+    pending = apply_leave(employee, next_weekday(30))
+
+    response = client.patch(
+        f"/admin/users/{seed['employees'][0].id}/location", json={"location": "Ahmedabad"}, headers=admin
+    )
+    assert response.status_code == 200
+
+    # Transitions after the move land on the new location's rows
+    assert client.post(f"/leaves/{pending}/reject", json={"rejection_reason": "no"}, headers=hr).status_code == 200
+
+    maintained = _rollup()
+    assert {key[3] for key in maintained} == {"Ahmedabad"}
+    assert all(count > 0 for count, _ in maintained.values())
+
+    LeaveStatsService.rebuild()
+    db.session.commit()
+    assert _rollup() == maintained
+
+
+def test_deltas_are_upserted_in_primary_key_order(seed, monkeypatch):
+    from app.services import leave_stats_service
+
+    captured = []
+    insert = leave_stats_service.dialect_insert
+
+    class Recording:
+        def __init__(self, model):
+            self.stmt = insert(model)
+
+        def values(self, rows):
+            captured.extend(rows)
+            return self.stmt.values(rows)
+
+    monkeypatch.setattr(leave_stats_service, "dialect_insert", Recording)
+    planned, emergency = seed["planned"].id, seed["emergency"].id
+    LeaveStatsService._apply_deltas({
+        (2031, 2, planned, "Pune", "PENDING"): (1, 2),
+        (2030, 5, emergency, "Pune", "APPROVED"): (1, 1),
+        (2031, 1, planned, "Ahmedabad", "PENDING"): (1, 3),
+        (2030, 5, planned, "Pune", "APPROVED"): (1, 1),
+    })
+
+    keys = [(r["year"], r["month"], str(r["leave_type_id"]), r["location"], r["status"]) for r in captured]
+    assert keys == sorted(keys)
@@ -0,0 +1,48 @@
+from app.extensions import db
+from app.models import LeaveLedger, LeaveType
+
+YEAR = 2040
+
+
+def _ledgers(year):
+    return {
+        (l.user_id, l.leave_type_id): (l.total_quota, l.used_days)
+        for l in LeaveLedger.query.filter_by(year=year)
+    }
+
+
+def test_rollover_creates_default_quotas_and_is_idempotent(app, seed):
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["ledger", "rollover", "--year", str(YEAR)])
+    assert result.exit_code == 0, result.output
+    ledgers = _ledgers(YEAR)
+    # 7 active users x 2 leave types
+    assert len(ledgers) == 14
+    assert ledgers[(seed["hr"].id, seed["planned"].id)] == (18, 0)
+    assert ledgers[(seed["hr"].id, seed["emergency"].id)] == (5, 0)
+
+    # Existing rows are left alone on a re-run (ON CONFLICT DO NOTHING)
+    db.session.query(LeaveLedger).filter_by(user_id=seed["hr"].id, year=YEAR).update({"used_days": 2})
+    db.session.commit()
+    result = runner.invoke(args=["ledger", "rollover", "--year", str(YEAR)])
+    assert result.exit_code == 0, result.output
+    assert "Created 0 leave ledger rows" in result.output
+    assert _ledgers(YEAR)[(seed["hr"].id, seed["planned"].id)] == (18, 2)
+
+
+def test_rollover_fills_gaps_for_new_types_and_skips_inactive(app, seed):
+    runner = app.test_cli_runner()
+    runner.invoke(args=["ledger", "rollover", "--year", str(YEAR)])
+
+    sick = LeaveType(name="Sick Leave", default_quota=7)
+    db.session.add(sick)
+    seed["employees"][0].is_active = False
+    db.session.commit()
+
+    result = runner.invoke(args=["ledger", "rollover", "--year", str(YEAR)])
+    assert result.exit_code == 0, result.output
+    assert "Created 6 leave ledger rows" in result.output
+    ledgers = _ledgers(YEAR)
+    assert (seed["employees"][0].id, sick.id) not in ledgers
+    assert ledgers[(seed["employees"][1].id, sick.id)] == (7, 0)
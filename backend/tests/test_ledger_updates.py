@@ -0,0 +1,39 @@
+import pytest
+
+from app.extensions import db
+from app.models import LeaveLedger
+from app.services.leave_ledger_service import LeaveLedgerService
+
+from conftest import next_weekday
+
+
+def _ledger(seed, user, year):
+    return LeaveLedger.query.filter_by(user_id=user.id, leave_type_id=seed["planned"].id, year=year).one()
+
+
+def test_bulk_deduction_counts_null_used_days_as_zero(client, seed, login, apply_leave):
+    employee = seed["employees"][0]
+    day = next_weekday(14)
+    leave_id = apply_leave(login(employee.email), day)
+    _ledger(seed, employee, day.year).used_days = None
+    db.session.commit()
+
+    body = client.post("/leaves/bulk-approve", headers=login("hr@nexus.com"), json={"leave_ids": [leave_id]}).get_json()
+    assert body["succeeded"] == 1
+
+    db.session.expire_all()
+    assert _ledger(seed, employee, day.year).used_days == 1
+
+
+def test_deduction_is_refused_beyond_the_quota(seed):
+    employee = seed["employees"][0]
+    year = next_weekday(0).year
+    ledger = _ledger(seed, employee, year)
+    ledger.used_days = 17
+    db.session.commit()
+
+    with pytest.raises(ValueError):
+        LeaveLedgerService.deduct_leave(employee.id, seed["planned"].id, 2, next_weekday(0))
+    db.session.rollback()
+
+    assert _ledger(seed, employee, year).used_days == 17
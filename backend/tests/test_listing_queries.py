@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+from app.extensions import db
+from app.models import LeaveRequest
+
+
+def _add_pending(seed, count, first=0):
+    start = date.today() + timedelta(days=30)
+    for i in range(first, first + count):
+        employee = seed["employees"][i % len(seed["employees"])]
+        day = start + timedelta(days=7 * i)
+        db.session.add(LeaveRequest(
+            user_id=employee.id, leave_type_id=seed["planned"].id,
+            start_date=day, end_date=day, total_days=1, status="PENDING", reason=f"r{i}"
+        ))
+    db.session.commit()
+
+
+def _get(client, path, headers, statement_count):
+    # First call warms the per-process auth and reference caches
+    client.get(path, headers=headers)
+    statement_count.clear()
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json(), statement_count[-1]
+
+
+def test_employees_page_query_count_is_constant(client, seed, login, statement_count):
+    headers = login("hr@nexus.com")
+
+    body, small = _get(client, "/leaves/employees?per_page=2", headers, statement_count)
+    assert len(body["items"]) == 2
+    body, large = _get(client, "/leaves/employees?per_page=5", headers, statement_count)
+    assert len(body["items"]) == 5
+    assert all(len(item["leave_balances"]) == 2 for item in body["items"])
+
+    # count + page + one batched ledger fetch, whatever the page size
+    assert small == large == 3
+
+
+def test_pending_page_query_count_is_constant(client, seed, login, statement_count):
+    headers = login("hr@nexus.com")
+
+    _add_pending(seed, 2)
+    body, few = _get(client, "/leaves/pending?per_page=20", headers, statement_count)
+    assert len(body["items"]) == 2
+
+    _add_pending(seed, 10, first=2)
+    body, many = _get(client, "/leaves/pending?per_page=20", headers, statement_count)
+    assert len(body["items"]) == 12
+    assert {item["employee_name"] for item in body["items"]} <= {e.full_name for e in seed["employees"]}
+
+    # count + page; user and leave type are joined into the page query
+    assert few == many == 2
+
+
+def test_pending_keyset_page_skips_count(client, seed, login, statement_count):
+    headers = login("hr@nexus.com")
+    _add_pending(seed, 5)
+
+    body, statements = _get(client, "/leaves/pending?per_page=20&cursor=", headers, statement_count)
+    assert len(body["items"]) == 5
+    assert "total" not in body
+    assert statements == 1
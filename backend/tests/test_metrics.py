@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def metrics_token(app):
+    app.config["METRICS_TOKEN"] = "scrape-me"
+    yield "scrape-me"
+    app.config.pop("METRICS_TOKEN")
+
+
+def test_loopback_scrape_is_labelled_per_worker(client, seed, login):
+    client.get("/leaves/my", headers=login("emp0@nexus.com"))
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    body = response.get_data(as_text=True)
+    assert "http_request_duration_seconds" in body
+    assert 'pid="' in body
+
+
+def test_other_networks_are_refused(client):
+    response = client.get("/metrics", environ_base={"REMOTE_ADDR": "10.0.0.5"})
+    assert response.status_code == 403
+
+
+def test_bearer_token_allows_any_network(client, metrics_token):
+    remote = {"REMOTE_ADDR": "10.0.0.5"}
+
+    wrong = client.get("/metrics", environ_base=remote, headers={"Authorization": "Bearer nope"})
+    assert wrong.status_code == 403
+
+    right = client.get("/metrics", environ_base=remote, headers={"Authorization": f"Bearer {metrics_token}"})
+    assert right.status_code == 200
@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta
+
+from app.extensions import db
+from app.models import LeaveRequest
+
+
+def _add_leaves(employee, leave_type, applied_at_values):
+    start = date.today() + timedelta(days=30)
+    for i, applied_at in enumerate(applied_at_values):
+        day = start + timedelta(days=7 * i)
+        leave = LeaveRequest(
+            user_id=employee.id, leave_type_id=leave_type.id,
+            start_date=day, end_date=day, total_days=1, status="PENDING", reason=f"r{i}"
+        )
+        # None keeps the server_default (CURRENT_TIMESTAMP, stored without fractional seconds)
+        if applied_at is not None:
+            leave.applied_at = applied_at
+        db.session.add(leave)
+    db.session.commit()
+
+
+def _walk(client, path, headers, per_page):
+    pages, cursor = [], ""
+    for _ in range(50):
+        body = client.get(f"{path}?per_page={per_page}&cursor={cursor}", headers=headers).get_json()
+        pages.append(body)
+        if not body["next_cursor"]:
+            return pages
+        cursor = body["next_cursor"]
+    raise AssertionError("keyset walk did not terminate")
+
+
+def _ids(page):
+    return [item["leave_id"] for item in page["items"]]
+
+
+def test_keyset_walks_server_default_timestamps_without_repeats(client, seed, login):
+    employee = seed["employees"][0]
+    _add_leaves(employee, seed["planned"], [None, None, None])
+    headers = login(employee.email)
+
+    pages = _walk(client, "/leaves/my", headers, per_page=1)
+    seen = [leave_id for page in pages for leave_id in _ids(page)]
+
+    assert len(pages) == 3
+    assert len(set(seen)) == len(seen) == 3
+
+    # Walking back from the last page returns the previous one
+    previous = client.get(f"/leaves/my?per_page=1&cursor={pages[-1]['prev_cursor']}", headers=headers).get_json()
+    assert _ids(previous) == _ids(pages[-2])
+
+
+def test_keyset_tied_and_mixed_precision_timestamps_forward_and_back(client, seed, login):
+    tied = datetime(2026, 3, 1, 9, 0, 0)
+    _add_leaves(seed["employees"][0], seed["planned"], [tied, tied, tied.replace(microsecond=500), tied, None])
+    _add_leaves(seed["employees"][1], seed["planned"], [tied, tied + timedelta(seconds=1)])
+    headers = login("hr@nexus.com")
+
+    expected = [item["leave_id"] for item in client.get("/leaves/all?per_page=50", headers=headers).get_json()["items"]]
+    assert len(expected) == 7
+
+    for per_page in (1, 2, 3):
+        pages = _walk(client, "/leaves/all", headers, per_page)
+        assert [leave_id for page in pages for leave_id in _ids(page)] == expected
+
+        # And back to the first page via prev_cursor
+        page = pages[-1]
+        backwards = [_ids(page)]
+        while page["prev_cursor"]:
+            page = client.get(f"/leaves/all?per_page={per_page}&cursor={page['prev_cursor']}", headers=headers).get_json()
+            backwards.insert(0, _ids(page))
+        assert [leave_id for ids in backwards for leave_id in ids] == expected
+
+
+def test_offset_pagination_clamps_per_page(client, seed, login):
+    headers = login("hr@nexus.com")
+
+    body = client.get("/leaves/employees?per_page=1000", headers=headers).get_json()
+    assert body["per_page"] == 100
+
+    body = client.get("/leaves/employees?per_page=0", headers=headers).get_json()
+    assert body["per_page"] == 1
+    assert len(body["items"]) == 1
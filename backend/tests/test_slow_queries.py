@@ -0,0 +1,33 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from app.models import LeaveLedger, User
+from app.utils.slow_queries import SlowQueryLog, _explain_prefix, _explainable
+
+
+def _sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_plain_reads_are_explained():
+    assert _explainable(_sql(select(User).where(User.email == "a@b.c")))
+    assert _explainable("  select count(*) from users")
+
+
+def test_locking_and_side_effect_selects_are_not():
+    assert not _explainable(_sql(select(LeaveLedger).with_for_update()))
+    assert not _explainable(_sql(select(LeaveLedger).with_for_update(read=True)))
+    assert not _explainable(_sql(select(LeaveLedger).with_for_update(key_share=True)))
+    assert not _explainable(_sql(select(func.pg_try_advisory_xact_lock(42))))
+    assert not _explainable("SELECT nextval('leave_seq')")
+    assert not _explainable("SELECT id, nextval('s') FROM users")
+    assert not _explainable("UPDATE users SET is_active = false")
+    assert not _explainable("WITH d AS (DELETE FROM users RETURNING id) SELECT * FROM d")
+
+
+def test_analyze_is_opt_in(app):
+    log = SlowQueryLog()
+    log.init_app(app)
+    assert log.explain_analyze is False
+    assert _explain_prefix(log.explain_analyze) == "EXPLAIN "
+    assert _explain_prefix(True) == "EXPLAIN (ANALYZE, BUFFERS) "
@@ -0,0 +1,115 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+import app.utils.cache as cache_module
+
+from app.extensions import db
+from app.models.holiday import Holiday
+from app.services.holiday_cache import holidays_changed
+from app.services.leave_calculator import calculate_leave_days, calculate_leave_days_bulk
+from app.services.working_calendar import working_calendar
+
+FRI = date(2030, 1, 4)
+MON = date(2030, 1, 7)
+
+
+def _holiday(day, location="All"):
+    db.session.add(Holiday(name=f"H {day}", date=day, location=location))
+    db.session.commit()
+
+
+def test_sandwich_rule_charges_weekend_between_leave_days():
+    assert calculate_leave_days(FRI, MON) == 4
+    assert calculate_leave_days(FRI, MON, sandwich=False) == 2
+
+
+def test_non_working_days_at_the_edges_are_not_charged():
+    _holiday(MON)
+    holidays_changed()
+
+    # Sat..Mon is all weekend/holiday
+    assert calculate_leave_days(date(2030, 1, 5), MON) == 0
+    # Fri..Tue: the holiday Monday is sandwiched, so charged
+    assert calculate_leave_days(FRI, date(2030, 1, 8)) == 5
+    assert calculate_leave_days(FRI, date(2030, 1, 8), sandwich=False) == 2
+
+
+def test_location_holidays_only_apply_to_that_location():
+    _holiday(MON, location="Pune")
+    holidays_changed()
+
+    assert working_calendar.count_working_days(MON, MON, "Pune") == 0
+    assert working_calendar.count_working_days(MON, MON, "Ahmedabad") == 1
+
+
+def test_ranges_spanning_a_year_boundary():
+    _holiday(date(2031, 1, 1))
+    holidays_changed()
+
+    # Tue 2030-12-31 .. Fri 2031-01-03 with New Year's Day off
+    assert calculate_leave_days(date(2030, 12, 31), date(2031, 1, 3), sandwich=False) == 3
+    assert calculate_leave_days(date(2030, 12, 31), date(2031, 1, 3)) == 4
+
+
+@pytest.mark.parametrize("sandwich", [True, False])
+def test_bulk_matches_single_calculation(sandwich):
+    _holiday(MON, location="Pune")
+    _holiday(date(2031, 1, 1))
+    holidays_changed()
+
+    starts = [FRI, MON, date(2030, 1, 11), date(2030, 1, 5), MON, date(2030, 12, 31), MON]
+    ends = [MON, FRI, date(2030, 1, 14), date(2030, 1, 6), date(2030, 1, 11), date(2031, 1, 3), date(2030, 1, 11)]
+    locations = ["Pune", "Pune", "Pune", "Pune", None, "Ahmedabad", "Ahmedabad"]
+    assert calculate_leave_days_bulk(starts, ends, locations, sandwich) == [
+        calculate_leave_days(s, e, loc, sandwich) if s <= e else 0
+        for s, e, loc in zip(starts, ends, locations)
+    ]
+
+
+def test_bulk_fetches_each_calendar_once(monkeypatch):
+    calls = []
+    get = working_calendar.get
+
+    def counting_get(year, location=None):
+        calls.append((year, location))
+        return get(year, location)
+
+    monkeypatch.setattr(working_calendar, "get", counting_get)
+    next_fri = date(2030, 1, 11)
+    days = calculate_leave_days_bulk([FRI, MON, MON, FRI], [MON, next_fri, next_fri, MON], ["Pune", "Pune", None, None])
+
+    assert days == [4, 5, 5, 4]
+    assert len(calls) == 2
+    assert set(calls) == {(2030, None), (2030, "Pune")}
+
+
+def test_cached_calendar_expires_for_writes_made_elsewhere(monkeypatch):
+    assert calculate_leave_days(MON, MON) == 1
+
+    # Another worker adds a holiday: this process is not told
+    _holiday(MON)
+    assert calculate_leave_days(MON, MON) == 1
+
+    later = cache_module.time.monotonic() + working_calendar._calendars.ttl + 1
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: later))
+    assert calculate_leave_days(MON, MON) == 0
+
+
+def test_build_overlapping_invalidate_is_not_cached(monkeypatch):
+    build = working_calendar._build
+
+    def racing_build(year, location):
+        calendar = build(year, location)
+        # A holiday write lands after this build read the holidays
+        monkeypatch.setattr(working_calendar, "_build", build)
+        _holiday(MON)
+        holidays_changed()
+        return calendar
+
+    monkeypatch.setattr(working_calendar, "_build", racing_build)
+    stale = working_calendar.get(2030)
+    assert stale.count(stale.index(MON), stale.index(MON)) == 1
+
+    assert calculate_leave_days(MON, MON) == 0
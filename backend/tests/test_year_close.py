@@ -0,0 +1,74 @@
+from app.extensions import db
+from app.models import LeaveLedger
+from app.services.leave_ledger_service import LeaveLedgerService
+from app.services.year_close_service import YearCloseService
+
+YEAR = 2040
+
+
+def _ledger(user, leave_type, year):
+    return LeaveLedger.query.filter_by(user_id=user.id, leave_type_id=leave_type.id, year=year).one()
+
+
+def _close(year):
+    report = YearCloseService.close_year(year)
+    db.session.commit()
+    db.session.expire_all()
+    return {row["leave_type"]: row for row in report}
+
+
+def _set_used(user, leave_type, year, used):
+    _ledger(user, leave_type, year).used_days = used
+    db.session.commit()
+
+
+def test_close_carries_encashes_and_lapses(seed):
+    LeaveLedgerService.generate_year(YEAR)
+    employee, planned = seed["employees"][0], seed["planned"]
+    # Planned Leave: 18 days, carry cap 5, encash cap 3
+    _set_used(employee, planned, YEAR, 8)
+
+    report = _close(YEAR)
+
+    closing = _ledger(employee, planned, YEAR)
+    following = _ledger(employee, planned, YEAR + 1)
+    assert closing.encashed_days == 3
+    assert (following.total_quota, following.carried_forward, following.used_days) == (23, 5, 0)
+    # Emergency Leave has no caps: nothing carries
+    assert _ledger(employee, seed["emergency"], YEAR + 1).total_quota == 5
+    assert report["Planned Leave"]["lapsed"] == report["Planned Leave"]["unused_days"] - 7 * 5 - 7 * 3
+
+
+def test_rerun_replaces_the_carry_and_keeps_adjustments(seed):
+    LeaveLedgerService.generate_year(YEAR)
+    employee, planned = seed["employees"][0], seed["planned"]
+    _close(YEAR)
+
+    # A manual +2 adjustment on next year's ledger, then the closing year changes
+    _ledger(employee, planned, YEAR + 1).total_quota += 2
+    db.session.commit()
+    _set_used(employee, planned, YEAR, 15)
+
+    _close(YEAR)
+    following = _ledger(employee, planned, YEAR + 1)
+    assert (following.total_quota, following.carried_forward) == (18 + 2 + 3, 3)
+
+
+def test_rerun_never_cuts_carry_below_days_already_used(seed):
+    LeaveLedgerService.generate_year(YEAR)
+    spent, unspent = seed["employees"][0], seed["employees"][1]
+    planned = seed["planned"]
+    _close(YEAR)
+
+    # 22 of 23 days (18 + 5 carried) already taken next year
+    _set_used(spent, planned, YEAR + 1, 22)
+    # The closing year is corrected: only 2 unused days are left to carry
+    _set_used(spent, planned, YEAR, 16)
+    _set_used(unspent, planned, YEAR, 16)
+
+    _close(YEAR)
+
+    following = _ledger(spent, planned, YEAR + 1)
+    assert (following.total_quota, following.carried_forward, following.used_days) == (22, 4, 22)
+    other = _ledger(unspent, planned, YEAR + 1)
+    assert (other.total_quota, other.carried_forward) == (20, 2)